@@ -0,0 +1,150 @@
+import glob
+import hashlib
+import os
+import struct
+
+import pygame
+
+ASSET_CACHE_DIR = 'assets/cache'
+# Entry file: this header, then width * height RGBA pixels
+ASSET_CACHE_MAGIC = b'CGA1'
+ASSET_CACHE_HEADER = struct.Struct('<4sII')  # magic, width, height
+ASSET_CACHE_EXTENSION = '.rgba'
+
+
+class AssetCache:
+    """
+    Raw RGBA pixels of decoded (and scaled) images on disk, so later
+    launches skip PNG decoding and scaling. Entries are named after
+    the source file's content hash and the scale step; editing an
+    image changes the hash, so its old entries are never used and
+    get replaced on the next store.
+    """
+
+    def __init__(self, cache_dir=ASSET_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.source_hashes = {}  # path -> hex digest, once per run
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0  # Misses that replaced an outdated entry
+
+    def _source_hash(self, path):
+        digest = self.source_hashes.get(path)
+        if digest is None:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            self.source_hashes[path] = digest
+        return digest
+
+    def _entry_prefix(self, path, scale_steps):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{stem}_{scale_steps}_")
+
+    def _entry_path(self, path, scale_steps):
+        # None if the source file can't be read
+        try:
+            digest = self._source_hash(path)
+        except OSError:
+            return None
+        return (self._entry_prefix(path, scale_steps) + digest +
+                ASSET_CACHE_EXTENSION)
+
+    def load(self, path, scale_steps):
+        """
+        Surface for path at scale_steps (not yet converted for the
+        display), or None on a miss.
+        """
+        entry_path = self._entry_path(path, scale_steps)
+        if entry_path is None:
+            return None
+        try:
+            with open(entry_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        if len(data) >= ASSET_CACHE_HEADER.size:
+            magic, width, height = ASSET_CACHE_HEADER.unpack_from(data)
+            pixels = memoryview(data)[ASSET_CACHE_HEADER.size:]
+            if (magic == ASSET_CACHE_MAGIC and
+                    len(pixels) == width * height * 4):
+                self.hits += 1
+                # The surface shares the bytes just read, no copy
+                return pygame.image.frombuffer(
+                    pixels, (width, height), 'RGBA')
+        # Truncated or from another format version
+        print(f"Warning: Ignoring damaged asset cache entry "
+              f"{entry_path}")
+        self.misses += 1
+        return None
+
+    def store(self, path, scale_steps, surface):
+        entry_path = self._entry_path(path, scale_steps)
+        if entry_path is None:
+            return
+        width, height = surface.get_size()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename, so a crash never leaves a partial
+            # entry under the real name
+            temp_path = entry_path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(ASSET_CACHE_HEADER.pack(
+                    ASSET_CACHE_MAGIC, width, height))
+                f.write(pygame.image.tobytes(surface, 'RGBA'))
+            os.replace(temp_path, entry_path)
+            # Drop entries made from older versions of the image
+            for old_path in glob.glob(
+                    self._entry_prefix(path, scale_steps) + '*' +
+                    ASSET_CACHE_EXTENSION):
+                if old_path != entry_path:
+                    os.remove(old_path)
+                    self.stale += 1
+        except OSError as e:
+            # The game runs fine without the cache, just slower
+            print(f"Warning: Could not write asset cache entry "
+                  f"{entry_path}: {e}")
+
+    def clear(self):
+        for entry_path in glob.glob(os.path.join(
+                self.cache_dir, '*' + ASSET_CACHE_EXTENSION)):
+            os.remove(entry_path)
+
+    def get_stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+        }
+
+
+def build_asset_cache(cache_dir=ASSET_CACHE_DIR):
+    """
+    Rebuilds the cache from scratch for every car image at every
+    scale the game uses. The game also fills it on first run; this
+    just does it ahead of time.
+    """
+    # Imported here: these modules import this one
+    from CarGame_AssetManager_v10 import AssetManager
+    from CarGame_PlayerCar_v10 import CAR_IMAGE_PATH, CAR_SCALE_FACTOR
+    from CarGame_BotCar_v10 import (
+        BOT_CAR_IMAGE_PATHS, get_bot_scale_factors
+    )
+
+    pygame.init()
+    # convert_alpha needs a display mode, even a hidden one
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    asset_cache = AssetCache(cache_dir)
+    asset_cache.clear()
+    asset_manager = AssetManager(asset_cache=asset_cache)
+    asset_manager.load_images([CAR_IMAGE_PATH] + BOT_CAR_IMAGE_PATHS)
+    asset_manager.get_scaled_image(CAR_IMAGE_PATH, CAR_SCALE_FACTOR)
+    for bot_image_path in BOT_CAR_IMAGE_PATHS:
+        for bot_scale in get_bot_scale_factors(CAR_SCALE_FACTOR):
+            asset_manager.get_scaled_image(bot_image_path, bot_scale)
+    pygame.quit()
+    print(f"Asset cache written to {cache_dir}")
+
+
+if __name__ == '__main__':
+    build_asset_cache()
@@ -0,0 +1,82 @@
+import collections
+import queue
+import threading
+import time
+
+import pygame
+
+# Main-thread time per frame for finishing loaded assets
+ASSET_LOAD_FRAME_BUDGET_SECONDS = 0.008
+
+
+class AssetLoader:
+    """
+    Loads images into an AssetManager on a worker thread while the
+    main loop keeps drawing. update() is called once per frame from
+    the main thread: it hands decoded images to the manager, then
+    runs queued tasks that need the display (scaling, prewarming
+    rotations) within a time budget.
+    """
+
+    def __init__(self, asset_manager, paths):
+        self.asset_manager = asset_manager
+        self.paths = [path for path in paths
+                      if path not in asset_manager.images]
+        self.finished = queue.Queue()
+        self.tasks = collections.deque()
+        self.num_decoded = 0
+        self.num_tasks = 0
+        self.num_tasks_done = 0
+
+        self.worker = threading.Thread(
+            target=self._run, name="AssetLoader", daemon=True
+        )
+        self.worker.start()
+
+    def _run(self):
+        for path in self.paths:
+            try:
+                image = self.asset_manager.decode_image(path)
+                error = None
+            except (pygame.error, OSError) as e:
+                image = None
+                error = e
+            self.finished.put((path, image, error))
+
+    def add_task(self, task):
+        # task() runs on the main thread once every image is loaded
+        self.tasks.append(task)
+        self.num_tasks += 1
+
+    def update(self, time_budget=ASSET_LOAD_FRAME_BUDGET_SECONDS):
+        while True:
+            try:
+                path, image, error = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            self.asset_manager.add_decoded_image(path, image, error)
+            self.num_decoded += 1
+        if self.num_decoded < len(self.paths):
+            return
+
+        # At least one task per call, however long it takes
+        start_time = time.perf_counter()
+        while self.tasks:
+            self.tasks.popleft()()
+            self.num_tasks_done += 1
+            if time.perf_counter() - start_time >= time_budget:
+                break
+
+    def get_progress(self):
+        # 0.0 to 1.0; exactly 1.0 only once is_done()
+        total_steps = len(self.paths) + self.num_tasks
+        if total_steps == 0:
+            return 1.0
+        return (self.num_decoded + self.num_tasks_done) / total_steps
+
+    def is_done(self):
+        return (self.num_decoded == len(self.paths) and
+                not self.tasks)
+
+    def close(self):
+        self.worker.join(timeout=1.0)
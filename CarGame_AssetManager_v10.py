@@ -0,0 +1,107 @@
+import pygame
+
+from CarGame_RotationCache_v10 import RotationCache
+
+# Scaled variants are cached per multiple of this step, so nearby
+# random scales share one surface
+SCALE_QUANTUM = 0.01
+# Scale steps of an unscaled image
+ORIGINAL_SCALE_STEPS = round(1.0 / SCALE_QUANTUM)
+
+
+def quantize_scale(scale):
+    return round(scale / SCALE_QUANTUM) * SCALE_QUANTUM
+
+
+class AssetManager:
+    """
+    Loads each image once and hands out shared, pre-converted
+    surfaces plus scaled variants keyed by (path, quantized scale).
+    Callers must treat returned surfaces as read-only.
+
+    With an asset_cache, decoded and scaled pixels are read from and
+    written to it instead of decoding PNGs and scaling every launch.
+    """
+
+    def __init__(self, rotation_cache=None, asset_cache=None):
+        if rotation_cache is None:
+            rotation_cache = RotationCache()
+        # Rotated frames of the surfaces handed out here
+        self.rotation_cache = rotation_cache
+        self.asset_cache = asset_cache
+        self.images = {}  # path -> surface, or None if loading failed
+        self.load_errors = {}  # path -> exception
+        self.scaled_images = {}  # (path, scale steps) -> surface
+
+    def decode_image(self, path):
+        """
+        Reads path from the asset cache, or decodes the file, without
+        converting it for the display, so it is safe to call off the
+        main thread. Raises like pygame.image.load; pygame 2 raises
+        FileNotFoundError for missing files.
+        """
+        image = self._load_cached(path, ORIGINAL_SCALE_STEPS)
+        if image is None:
+            image = pygame.image.load(path)
+            self._store_cached(path, ORIGINAL_SCALE_STEPS, image)
+        return image
+
+    def add_decoded_image(self, path, image, error=None):
+        # Main thread only (convert_alpha needs the display). image
+        # is None when decoding failed with error.
+        if image is None:
+            print(f"Warning: Error loading image {path}: {error}")
+            self.images[path] = None
+            self.load_errors[path] = error
+        else:
+            self.images[path] = image.convert_alpha()
+
+    def load_images(self, paths):
+        # Call after pygame.display.set_mode so convert_alpha works
+        for path in paths:
+            if path in self.images:
+                continue
+            try:
+                image = self.decode_image(path)
+                error = None
+            except (pygame.error, OSError) as e:
+                image = None
+                error = e
+            self.add_decoded_image(path, image, error)
+
+    def _load_cached(self, path, scale_steps):
+        if self.asset_cache is None:
+            return None
+        return self.asset_cache.load(path, scale_steps)
+
+    def _store_cached(self, path, scale_steps, surface):
+        if self.asset_cache is not None:
+            self.asset_cache.store(path, scale_steps, surface)
+
+    def get_image(self, path):
+        # None if the file couldn't be loaded; callers provide
+        # their own fallback
+        if path not in self.images:
+            self.load_images([path])
+        return self.images[path]
+
+    def get_scaled_image(self, path, scale):
+        scale_steps = round(scale / SCALE_QUANTUM)
+        key = (path, scale_steps)
+        scaled_image = self.scaled_images.get(key)
+        if scaled_image is None:
+            image = self.get_image(path)
+            if image is None:
+                return None
+            scaled_image = self._load_cached(path, scale_steps)
+            if scaled_image is not None:
+                scaled_image = scaled_image.convert_alpha()
+            else:
+                quantized = scale_steps * SCALE_QUANTUM
+                width = int(image.get_width() * quantized)
+                height = int(image.get_height() * quantized)
+                scaled_image = pygame.transform.scale(image,
+                                                      (width, height))
+                self._store_cached(path, scale_steps, scaled_image)
+            self.scaled_images[key] = scaled_image
+        return scaled_image
@@ -1,37 +1,518 @@
 import pygame
 import random
 import math
+import threading
+
+from CarGame_SurfaceCache_v10 import SurfaceCache
+from CarGame_ChunkPrefetcher_v10 import ChunkPrefetcher
+from CarGame_TerrainGenerators_v10 import GrassGenerator
+
+try:
+    import numpy
+except ImportError:  # Fall back to per-cell Python loops
+    numpy = None
+
+# Render modes for the grass layer
+# One pygame.draw.rect per grid cell (original behaviour)
+BACKGROUND_MODE_RECTS = "rects"
+# One texel per grid cell, upscaled with a single transform.scale
+BACKGROUND_MODE_LOW_RES = "low_res"
+# Low-res rows kept in a wrap-around ring buffer; only rows that
+# scroll into view are rasterized
+BACKGROUND_MODE_SCROLLING = "scrolling"
+# World cut into fixed-height chunks, each rendered once and kept in
+# an LRU cache
+BACKGROUND_MODE_CHUNKED = "chunked"
+
+GRASS_CHUNK_ROWS = 32  # Grid rows per cached chunk
+GRASS_CHUNK_CACHE_MAX_BYTES = 16 * 1024 * 1024
 
 
 class Background:
     def __init__(self, screen_width, screen_height, pixel_size,
-                 bg_colours):
+                 bg_colours, render_mode=BACKGROUND_MODE_LOW_RES,
+                 chunk_cache_max_bytes=GRASS_CHUNK_CACHE_MAX_BYTES,
+                 prefetch_chunks=False, indexed_colour=False,
+                 terrain_generator=None, chunk_margin_cols=0):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.pixel_size = pixel_size
+        self.render_mode = render_mode
 
-        self.bg_colours = bg_colours
+        if terrain_generator is None:
+            terrain_generator = GrassGenerator(bg_colours)
+        self.terrain_generator = terrain_generator
+        # Current palette; starts as the generator's own colours
+        self.bg_colours = list(self.terrain_generator.colours)
+        # Extra palette entries after bg_colours, used by shapes baked
+        # into the chunks (see bake_obstacle)
+        self.overlay_colours = []
         self.noise_seed = random.randint(0, 1000000000)
-        self.prime1 = 73856093
-        self.prime2 = 19349663
 
-        self.grass_buffer = pygame.Surface(
-            (self.screen_width, self.screen_height))
-        self.grass_buffer = self.grass_buffer.convert()
+        self.num_cols = math.ceil(self.screen_width / self.pixel_size)
+        # One extra row covers the partially visible row when the
+        # camera sits between two grid lines.
+        self.num_rows = (
+            math.ceil(self.screen_height / self.pixel_size) + 1
+        )
+        # Chunks also cover this many grid columns beyond each side
+        # of the screen, for views zoomed out past its edges
+        self.chunk_margin_cols = chunk_margin_cols
+        self.chunk_cols = self.num_cols + 2 * chunk_margin_cols
+        self.chunk_margin_pixels = chunk_margin_cols * pixel_size
+
+        # Indexed colour keeps 8-bit palette indices instead of
+        # full-colour pixels: a quarter of the memory, and
+        # set_palette() recolours everything without re-rasterizing.
+        self.indexed_colour = indexed_colour
+        # Every grass surface copies this pixel format, so chunks can
+        # be created off the main thread without calling convert().
+        # The prefetch worker copies it too: only touch it while
+        # holding surface_format_lock.
+        self.surface_format_lock = threading.Lock()
+        if self.indexed_colour:
+            self.surface_format = pygame.Surface((1, 1), 0, 8)
+            self.surface_format.set_palette(self._get_palette())
+        else:
+            self.surface_format = pygame.Surface((1, 1)).convert()
+
+        if self.render_mode in (BACKGROUND_MODE_LOW_RES,
+                                BACKGROUND_MODE_SCROLLING):
+            # Small surface holding one texel per grid cell
+            self.grass_texels = self._new_surface(
+                (self.num_cols, self.num_rows))
+            self.grass_buffer = self._new_surface(
+                (self.num_cols * self.pixel_size,
+                 self.num_rows * self.pixel_size))
+        elif self.render_mode == BACKGROUND_MODE_CHUNKED:
+            # Chunks are drawn straight from the cache
+            self.grass_texels = None
+            self.grass_buffer = self._new_surface((0, 0))
+        else:
+            self.grass_texels = None
+            self.grass_buffer = self._new_surface(
+                (self.screen_width, self.screen_height))
+        # The budget is for screen-wide chunks; chunks with side
+        # margins hold the same rows in more bytes
+        self.chunk_cache = SurfaceCache(
+            chunk_cache_max_bytes * self.chunk_cols // self.num_cols)
+        # Bumped whenever already rendered chunks go stale (a
+        # full-colour palette change); prefetched chunks carry the
+        # generation they were requested in
+        self.palette_generation = 0
+        self.chunk_prefetcher = None
+        if prefetch_chunks and self.render_mode == BACKGROUND_MODE_CHUNKED:
+            self.chunk_prefetcher = ChunkPrefetcher(self._render_chunk)
+        # Frames where a visible chunk had to be rendered on the
+        # main thread because it wasn't ready yet
+        self.chunk_stall_frames = 0
+        # chunk index -> [(chunk-local Rect, colour)] of obstacles
+        # baked into that chunk, re-applied if it's rendered again
+        self.baked_rects = {}
+        # Zoom levels with scaled chunk copies in chunk_cache, keyed
+        # (chunk index, zoom)
+        self.chunk_mip_zooms = set()
+        self._update_colour_table()
+        # World row currently held in the first row of grass_buffer
+        self.buffer_start_row = None
+
+    def _new_surface(self, size):
+        with self.surface_format_lock:
+            new_surface = pygame.Surface(size, 0, self.surface_format)
+        if self.indexed_colour:
+            # The palette isn't copied along with the format
+            new_surface.set_palette(self._get_palette())
+        return new_surface
+
+    def _get_palette(self):
+        return self.bg_colours + self.overlay_colours
+
+    def _apply_palette(self):
+        palette = self._get_palette()
+        with self.surface_format_lock:
+            self.surface_format.set_palette(palette)
+        grass_surfaces = [self.grass_buffer]
+        if self.grass_texels is not None:
+            grass_surfaces.append(self.grass_texels)
+        grass_surfaces.extend(self.chunk_cache.values())
+        for grass_surface in grass_surfaces:
+            grass_surface.set_palette(palette)
+
+    def _update_colour_table(self):
+        if numpy is not None:
+            # RGB lookup table indexed by colour index
+            self.colour_table = numpy.array(
+                [tuple(colour)[:3] for colour in self.bg_colours],
+                dtype=numpy.uint8
+            )
+
+    def set_palette(self, colours):
+        """
+        Replaces bg_colours entry for entry (day/night tints, biome
+        themes, colour-blind palettes). In indexed mode this only
+        swaps the palette of the existing surfaces; otherwise the
+        grass is re-rasterized.
+        """
+        if len(colours) != len(self.bg_colours):
+            raise ValueError(
+                f"Expected {len(self.bg_colours)} colours, "
+                f"got {len(colours)}"
+            )
+        self.bg_colours = list(colours)
+        self._update_colour_table()
+
+        if self.indexed_colour:
+            self._apply_palette()
+        else:
+            self.chunk_cache.clear()
+            self.buffer_start_row = None
+            # Chunks being prefetched use the old colours: drop them
+            # when they arrive, and let them be requested again
+            self.palette_generation += 1
+            if self.chunk_prefetcher is not None:
+                self.chunk_prefetcher.cancel()
+
+    def get_grass_color_index(self, world_grid_x, world_grid_y):
+        return self.terrain_generator.color_index(
+            self.noise_seed, world_grid_x, world_grid_y)
 
     def get_grass_color(self, world_grid_x, world_grid_y):
-        hash_val = (
-            world_grid_x * self.prime1 ^
-            world_grid_y * self.prime2 ^
-            self.noise_seed
-        )
-        idx = abs(hash_val) % len(self.bg_colours)
+        idx = self.get_grass_color_index(world_grid_x, world_grid_y)
         return self.bg_colours[idx]
 
+    def get_grass_color_indices(self, first_col, first_row,
+                                num_cols, num_rows):
+        """
+        Vectorized get_grass_color_index for a rectangle of grid
+        cells, indexed [col, row] like pygame.surfarray (nested lists
+        without NumPy).
+        """
+        return self.terrain_generator.color_indices(
+            self.noise_seed, first_col, first_row, num_cols, num_rows)
+
+    def _rasterize_texels(self, texels, start_world_row, indices=None):
+        if indices is None:
+            indices = self.get_grass_color_indices(
+                0, start_world_row,
+                texels.get_width(), texels.get_height()
+            )
+        if numpy is not None:
+            if self.indexed_colour:
+                pygame.surfarray.blit_array(texels, indices)
+            else:
+                pygame.surfarray.blit_array(
+                    texels, self.colour_table[indices])
+            return
+
+        for world_grid_x, column in enumerate(indices):
+            for row, idx in enumerate(column):
+                if self.indexed_colour:
+                    # An int is written as the raw palette index
+                    texels.set_at((world_grid_x, row), idx)
+                else:
+                    texels.set_at((world_grid_x, row),
+                                  self.bg_colours[idx])
+
     # def draw(self, surface): # Old signature
-    def draw(self, surface, camera_world_y, world_unit_scale):
+    def draw(self, surface, camera_world_y, world_unit_scale,
+             view_zoom=None):
+        # view_zoom (a ViewZoom) is only supported when chunked;
+        # other modes always draw unzoomed
         camera_pixel_y_offset = camera_world_y * world_unit_scale
 
+        if self.render_mode == BACKGROUND_MODE_LOW_RES:
+            self._draw_low_res(surface, camera_pixel_y_offset)
+        elif self.render_mode == BACKGROUND_MODE_SCROLLING:
+            self._draw_scrolling(surface, camera_pixel_y_offset)
+        elif self.render_mode == BACKGROUND_MODE_CHUNKED:
+            self._draw_chunked(surface, camera_pixel_y_offset,
+                               view_zoom)
+        else:
+            self._draw_rects(surface, camera_pixel_y_offset)
+
+    def _draw_low_res(self, surface, camera_pixel_y_offset):
+        start_world_row = math.floor(
+            camera_pixel_y_offset / self.pixel_size)
+
+        # The texels only change when the camera crosses a grid
+        # line; in between, only the sub-cell offset moves.
+        if start_world_row != self.buffer_start_row:
+            self._rasterize_texels(self.grass_texels, start_world_row)
+            # Nearest-neighbour upscale: every texel becomes a
+            # pixel_size x pixel_size block
+            pygame.transform.scale(
+                self.grass_texels, self.grass_buffer.get_size(),
+                self.grass_buffer
+            )
+            self.buffer_start_row = start_world_row
+
+        # Same rounding the per-cell path applies to each row, so
+        # the output matches it pixel for pixel. (Only an odd
+        # pixel_size with an offset of exactly .5 differs, where
+        # round() would alternate between rows and leave gaps.)
+        draw_y = round(
+            start_world_row * self.pixel_size - camera_pixel_y_offset
+        )
+        surface.blit(self.grass_buffer, (0, draw_y))
+
+    def _paint_ring_slots(self, first_world_row, num_rows):
+        # World row r lives in ring slot r % num_rows. The range
+        # given here must not wrap past the end of the ring.
+        first_slot = first_world_row % self.num_rows
+        texels = self.grass_texels.subsurface(
+            (0, 0, self.num_cols, num_rows))
+        self._rasterize_texels(texels, first_world_row)
+        slot_pixels = self.grass_buffer.subsurface(
+            (0, first_slot * self.pixel_size,
+             self.num_cols * self.pixel_size,
+             num_rows * self.pixel_size)
+        )
+        pygame.transform.scale(
+            texels, slot_pixels.get_size(), slot_pixels)
+
+    def _paint_world_rows(self, first_world_row, end_world_row):
+        world_row = first_world_row
+        while world_row < end_world_row:
+            slots_before_wrap = (
+                self.num_rows - world_row % self.num_rows
+            )
+            count = min(slots_before_wrap, end_world_row - world_row)
+            self._paint_ring_slots(world_row, count)
+            world_row += count
+
+    def _draw_scrolling(self, surface, camera_pixel_y_offset):
+        start_world_row = math.floor(
+            camera_pixel_y_offset / self.pixel_size)
+        end_world_row = start_world_row + self.num_rows
+
+        if (self.buffer_start_row is None or
+                abs(start_world_row - self.buffer_start_row) >=
+                self.num_rows):
+            # First frame, restart or a jump further than the
+            # buffer: nothing in the ring can be reused.
+            self._paint_world_rows(start_world_row, end_world_row)
+        elif start_world_row < self.buffer_start_row:
+            # Camera moved up: new rows appear at the top
+            self._paint_world_rows(start_world_row,
+                                   self.buffer_start_row)
+        elif start_world_row > self.buffer_start_row:
+            # Camera moved down: new rows appear at the bottom
+            old_end_world_row = self.buffer_start_row + self.num_rows
+            self._paint_world_rows(old_end_world_row, end_world_row)
+        self.buffer_start_row = start_world_row
+
+        draw_y = round(
+            start_world_row * self.pixel_size - camera_pixel_y_offset
+        )
+        # The ring holds the visible rows as two runs of slots:
+        # start slot to the end of the buffer, then from slot 0.
+        split_y = (start_world_row % self.num_rows) * self.pixel_size
+        buffer_width, buffer_height = self.grass_buffer.get_size()
+        surface.blit(self.grass_buffer, (0, draw_y),
+                     (0, split_y, buffer_width, buffer_height - split_y))
+        if split_y > 0:
+            surface.blit(self.grass_buffer,
+                         (0, draw_y + buffer_height - split_y),
+                         (0, 0, buffer_width, split_y))
+
+    def _render_chunk(self, chunk_index):
+        # Chunk n covers world rows n * GRASS_CHUNK_ROWS up to
+        # (n + 1) * GRASS_CHUNK_ROWS - 1. Also runs on the prefetch
+        # thread, so it only touches surfaces it creates itself.
+        # Column 0 of the chunk is grid column -chunk_margin_cols.
+        texels = self._new_surface((self.chunk_cols, GRASS_CHUNK_ROWS))
+        indices = self.terrain_generator.generate_chunk(
+            self.noise_seed, chunk_index,
+            self.chunk_cols, GRASS_CHUNK_ROWS, -self.chunk_margin_cols
+        )
+        self._rasterize_texels(texels, chunk_index * GRASS_CHUNK_ROWS,
+                               indices)
+        chunk_surface = self._new_surface(
+            (self.chunk_cols * self.pixel_size,
+             GRASS_CHUNK_ROWS * self.pixel_size)
+        )
+        pygame.transform.scale(
+            texels, chunk_surface.get_size(), chunk_surface)
+        return chunk_surface
+
+    def _chunk_range(self, pixel_top, pixel_bottom):
+        # Chunks overlapping world pixel rows [pixel_top, pixel_bottom)
+        start_world_row = math.floor(pixel_top / self.pixel_size)
+        end_world_row_exclusive = math.ceil(
+            pixel_bottom / self.pixel_size)
+        first_chunk = start_world_row // GRASS_CHUNK_ROWS
+        last_chunk = (end_world_row_exclusive - 1) // GRASS_CHUNK_ROWS
+        return range(first_chunk, last_chunk + 1)
+
+    def _store_chunk(self, chunk_index, chunk_surface,
+                     palette_generation=None):
+        # palette_generation: when a prefetched chunk was requested;
+        # chunks rendered before the last palette change are dropped
+        if (palette_generation is not None and
+                palette_generation != self.palette_generation):
+            return
+        if self.indexed_colour:
+            # The palette may have changed while the prefetch worker
+            # was rendering this chunk
+            chunk_surface.set_palette(self._get_palette())
+        for local_rect, colour in self.baked_rects.get(chunk_index, ()):
+            pygame.draw.rect(chunk_surface, colour, local_rect)
+        self.chunk_cache.put(chunk_index, chunk_surface)
+
+    def get_chunk(self, chunk_index):
+        chunk_surface = self.chunk_cache.get(chunk_index)
+        if chunk_surface is None:
+            chunk_surface = self._render_chunk(chunk_index)
+            self._store_chunk(chunk_index, chunk_surface)
+        return chunk_surface
+
+    def bake_obstacle(self, obstacle, world_unit_scale):
+        """
+        Draws a static obstacle into every chunk it overlaps, so it
+        costs nothing per frame. Returns False when the background
+        isn't chunked and the obstacle still has to be drawn.
+        """
+        if self.render_mode != BACKGROUND_MODE_CHUNKED:
+            return False
+
+        colour = pygame.Color(obstacle.color)
+        if (self.indexed_colour and
+                colour not in self._get_palette()):
+            self.overlay_colours.append(colour)
+            self._apply_palette()
+
+        # Same rounding as Obstacle.update_screen_rect, in world
+        # pixels instead of screen pixels
+        world_rect = pygame.Rect(
+            0, 0,
+            round(obstacle.width_world * world_unit_scale),
+            round(obstacle.height_world * world_unit_scale)
+        )
+        world_rect.center = (
+            round(obstacle.world_x * world_unit_scale),
+            round(obstacle.world_y * world_unit_scale)
+        )
+
+        chunk_pixel_height = GRASS_CHUNK_ROWS * self.pixel_size
+        first_chunk = world_rect.top // chunk_pixel_height
+        last_chunk = (world_rect.bottom - 1) // chunk_pixel_height
+        # An obstacle straddling a chunk edge is drawn into both
+        # chunks, each clipping its own part
+        for chunk_index in range(first_chunk, last_chunk + 1):
+            local_rect = world_rect.move(
+                self.chunk_margin_pixels,
+                -chunk_index * chunk_pixel_height)
+            self.baked_rects.setdefault(chunk_index, []).append(
+                (local_rect, colour))
+            if chunk_index in self.chunk_cache:
+                chunk_surface = self.chunk_cache.peek(chunk_index)
+                pygame.draw.rect(chunk_surface, colour, local_rect)
+            # Scaled copies are rebuilt from the updated chunk
+            for zoom in self.chunk_mip_zooms:
+                self.chunk_cache.discard((chunk_index, zoom))
+        return True
+
+    def prefetch(self, camera_world_y, predicted_camera_world_y,
+                 world_unit_scale):
+        """
+        Queues every chunk between the current viewport and the one
+        expected at predicted_camera_world_y for the worker thread.
+        """
+        if self.chunk_prefetcher is None:
+            return
+        pixel_top = min(camera_world_y, predicted_camera_world_y) * (
+            world_unit_scale)
+        pixel_bottom = (
+            max(camera_world_y, predicted_camera_world_y) *
+            world_unit_scale + self.screen_height
+        )
+        # Camera moves towards negative y, so the lowest index is
+        # the furthest ahead; queue the nearest chunks first.
+        for chunk_index in reversed(
+                self._chunk_range(pixel_top, pixel_bottom)):
+            if chunk_index not in self.chunk_cache:
+                self.chunk_prefetcher.request(
+                    chunk_index, self.palette_generation)
+
+    def close(self):
+        if self.chunk_prefetcher is not None:
+            self.chunk_prefetcher.close()
+            self.chunk_prefetcher = None
+
+    def _get_chunk_mip(self, chunk_index, chunk_surface, zoom):
+        # chunk_surface scaled by zoom, cached next to the chunk
+        key = (chunk_index, zoom)
+        mip_surface = self.chunk_cache.get(key)
+        if mip_surface is None:
+            width, height = chunk_surface.get_size()
+            # Plain scale: keeps 8-bit chunks 8-bit and palette-
+            # driven, and the grass cells sharp
+            mip_surface = pygame.transform.scale(
+                chunk_surface, (round(width * zoom), round(height * zoom))
+            )
+            self.chunk_cache.put(key, mip_surface)
+            self.chunk_mip_zooms.add(zoom)
+        return mip_surface
+
+    def _draw_chunked(self, surface, camera_pixel_y_offset,
+                      view_zoom=None):
+        if self.chunk_prefetcher is not None:
+            for chunk_index, generation, chunk_surface in (
+                    self.chunk_prefetcher.collect()):
+                self._store_chunk(chunk_index, chunk_surface,
+                                  generation)
+
+        chunk_pixel_height = GRASS_CHUNK_ROWS * self.pixel_size
+        zoomed = view_zoom is not None and view_zoom.is_zoomed()
+        view_top, view_bottom = 0, self.screen_height
+        if zoomed:
+            # Zoomed out, the view reaches further ahead
+            _, view_top, _, view_bottom = view_zoom.get_base_bounds()
+        visible_chunks = self._chunk_range(
+            camera_pixel_y_offset + view_top,
+            camera_pixel_y_offset + view_bottom
+        )
+        stalled = False
+        for chunk_index in visible_chunks:
+            chunk_surface = self.chunk_cache.get(chunk_index)
+            if chunk_surface is None:
+                # Not ready: render it here rather than wait on the
+                # worker, which may not even have started on it.
+                stalled = True
+                chunk_surface = self._render_chunk(chunk_index)
+                self._store_chunk(chunk_index, chunk_surface)
+            if zoomed:
+                draw_x, draw_y = view_zoom.to_screen(
+                    -self.chunk_margin_pixels,
+                    chunk_index * chunk_pixel_height -
+                    camera_pixel_y_offset
+                )
+                surface.blit(
+                    self._get_chunk_mip(chunk_index, chunk_surface,
+                                        view_zoom.zoom),
+                    (round(draw_x), round(draw_y))
+                )
+                continue
+            draw_y = round(
+                chunk_index * chunk_pixel_height -
+                camera_pixel_y_offset
+            )
+            surface.blit(chunk_surface,
+                         (-self.chunk_margin_pixels, draw_y))
+        if stalled and self.chunk_prefetcher is not None:
+            self.chunk_stall_frames += 1
+
+        # The camera only moves up, so baked obstacles in chunks
+        # below the viewport will never be drawn again
+        passed_chunks = [
+            chunk_index for chunk_index in self.baked_rects
+            if chunk_index > visible_chunks[-1]
+        ]
+        for chunk_index in passed_chunks:
+            del self.baked_rects[chunk_index]
+
+    def _draw_rects(self, surface, camera_pixel_y_offset):
+
         start_world_row = math.floor(
             camera_pixel_y_offset / self.pixel_size)
         end_world_row_exclusive = math.ceil(
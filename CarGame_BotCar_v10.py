@@ -2,6 +2,8 @@ import pygame
 import math
 import random
 
+from CarGame_AssetManager_v10 import quantize_scale, SCALE_QUANTUM
+
 BOT_CAR_IMAGE_PATHS = [
     'assets/images/car_2.png', 'assets/images/car_3.png',
     'assets/images/car_4.png', 'assets/images/car_5.png',
@@ -25,10 +27,22 @@ DONUT_ANGULAR_SPEED_RAD_PER_SEC_MIN = math.pi / 2  # 90 deg/sec
 DONUT_ANGULAR_SPEED_RAD_PER_SEC_MAX = math.pi  # 180 deg/sec
 
 
+def get_bot_scale_factors(base_player_scale_factor):
+    # Every quantized scale factor a bot can spawn with
+    lowest_step = round(quantize_scale(
+        base_player_scale_factor * MIN_BOT_SCALE_FACTOR_REL
+    ) / SCALE_QUANTUM)
+    highest_step = round(quantize_scale(
+        base_player_scale_factor * MAX_BOT_SCALE_FACTOR_REL
+    ) / SCALE_QUANTUM)
+    return [step * SCALE_QUANTUM
+            for step in range(lowest_step, highest_step + 1)]
+
+
 class BotCar:
     def __init__(self, world_x, world_y, world_unit_scale,
                  player_max_speed_world, base_player_scale_factor,
-                 screen_width_world):
+                 screen_width_world, asset_manager):
         self.world_x = float(world_x)
         self.world_y = float(world_y)
         self.initial_world_x = self.world_x  # Store for relative movements
@@ -40,15 +54,19 @@ class BotCar:
         scale_multiplier = random.uniform(
             MIN_BOT_SCALE_FACTOR_REL, MAX_BOT_SCALE_FACTOR_REL
         )
-        self.current_scale_factor = (
+        # Quantized so bots share the asset manager's scaled copies
+        self.current_scale_factor = quantize_scale(
             base_player_scale_factor * scale_multiplier
         )
 
-        try:
-            self.image_unrotated_original = pygame.image.load(
-                image_path
-            ).convert_alpha()
-        except pygame.error as e:
+        self.image_unrotated_original = asset_manager.get_image(
+            image_path)
+        if self.image_unrotated_original is not None:
+            self.image_original_scaled = (
+                asset_manager.get_scaled_image(
+                    image_path, self.current_scale_factor)
+            )
+        else:
             print(
                 f"Error loading bot car image: {image_path}, "
                 "using fallback."
@@ -57,20 +75,43 @@ class BotCar:
             self.image_unrotated_original.fill(pygame.Color("purple"))
             self.current_scale_factor = base_player_scale_factor
 
-        img_w = self.image_unrotated_original.get_width()
-        img_h = self.image_unrotated_original.get_height()
-        width = int(img_w * self.current_scale_factor)
-        height = int(img_h * self.current_scale_factor)
-
-        self.image_original_scaled = pygame.transform.scale(
-            self.image_unrotated_original, (width, height)
-        )
+            img_w = self.image_unrotated_original.get_width()
+            img_h = self.image_unrotated_original.get_height()
+            width = int(img_w * self.current_scale_factor)
+            height = int(img_h * self.current_scale_factor)
+            self.image_original_scaled = pygame.transform.scale(
+                self.image_unrotated_original, (width, height)
+            )
         self.image = self.image_original_scaled  # Current image to draw
+        # Part of self.image to draw; None for the whole surface (set
+        # when the frame lives on a sprite atlas page)
+        self.image_area = None
+        self.rotation_cache = asset_manager.rotation_cache
+        # self.image is only re-rotated when the bot is drawn or
+        # collision-tested and its angle moved to another cache step.
+        # Starts dirty so even the unrotated frame comes from the
+        # shared cache/atlas.
+        self.image_dirty = True
+        # Half the sprite diagonal: no rotation of the image reaches
+        # further than this from its centre
+        self.max_half_extent_pixels = math.ceil(
+            math.hypot(*self.image_original_scaled.get_size()) / 2
+        )
 
         self.image_rect = self.image.get_rect()
         # Note: The scale factor for collision rect is hardcoded here
         self.bot_collision_rect_scale_factor = 0.75
         self.collision_rect = self.image_rect.copy()
+        # Oriented collision box: the unrotated sprite shrunk like
+        # collision_rect, turning with angle_visual
+        self.obb_half_width = (
+            self.image_original_scaled.get_width() *
+            self.bot_collision_rect_scale_factor / 2
+        )
+        self.obb_half_length = (
+            self.image_original_scaled.get_height() *
+            self.bot_collision_rect_scale_factor / 2
+        )
         # Initial call to _update_collision_rect_from_image_rect
         # might be redundant as update_screen_rects will be called
         # before first collision check. However, good for completeness
@@ -94,10 +135,10 @@ class BotCar:
         self.curve_steer_rate_world = 0.0
 
         self.donut_center_x_world = self.world_x
-        self.donut_center_y_world = self.world_y
         self.donut_radius_world = 0
         self.donut_angular_speed = 0
-        self.donut_current_angle = random.uniform(0, 2 * math.pi)
+        # Angle around the circle at spawn
+        self.donut_start_angle = random.uniform(0, 2 * math.pi)
         self.donut_drift_y_speed_world = 0
 
         max_bot_abs_speed_world = (
@@ -177,16 +218,18 @@ class BotCar:
             self.donut_center_x_world = (
                 screen_width_world / 2 + rand_offset
             )
-            cos_angle = math.cos(self.donut_current_angle)
-            self.world_x = (
-                self.donut_center_x_world +
-                self.donut_radius_world * cos_angle
-            )
+            # The circle's centre starts at the spawn y
             self.initial_world_y = world_y
-            self.donut_center_y_world = self.initial_world_y
 
-        self.current_y_velocity_world = self.base_y_velocity_world
+        # Where the bot is at time_alive 0 (a donut bot starts on its
+        # circle); every later position follows from time_alive
+        self.spawn_world_x = self.world_x
+        self.world_x, self.world_y = self.get_world_position(0.0)
+        self.current_y_velocity_world = self.get_world_velocity(0.0)[1]
         self.passed_by_player = False
+        # Position before the last update, for swept collisions
+        self.previous_world_x = self.world_x
+        self.previous_world_y = self.world_y
 
     def _update_collision_rect_from_image_rect(self):
         # This method uses self.image_rect (already positioned)
@@ -204,7 +247,57 @@ class BotCar:
         # Correctly use the positioned image_rect's center
         self.collision_rect.center = self.image_rect.center
 
+    def refresh_image(self):
+        # Returns True if the rotated image had to be rebuilt
+        if not self.image_dirty:
+            return False
+        self.image, self.image_area = self.rotation_cache.get_frame(
+            self.image_original_scaled, -self.angle_visual
+        )
+        self.image_dirty = False
+        return True
+
+    def get_mask(self):
+        # Collision mask of the current rotated image, placed at
+        # image_rect (call update_screen_rects first)
+        return self.rotation_cache.get_mask(
+            self.image_original_scaled, -self.angle_visual
+        )
+
+    def get_obb(self, camera_world_y):
+        # Screen-space oriented box, see CarGame_Collision_v10
+        return (
+            self.world_x * self.world_unit_scale,
+            (self.world_y - camera_world_y) * self.world_unit_scale,
+            self.obb_half_width, self.obb_half_length,
+            math.radians(self.angle_visual)
+        )
+
+    def get_screen_motion(self):
+        # Pixels moved by the last update, as (dx, dy)
+        return (
+            (self.world_x - self.previous_world_x) *
+            self.world_unit_scale,
+            (self.world_y - self.previous_world_y) *
+            self.world_unit_scale
+        )
+
+    def get_screen_center_y(self, camera_world_y):
+        return round(
+            (self.world_y - camera_world_y) * self.world_unit_scale
+        )
+
+    def is_in_view_band(self, camera_world_y, view_height,
+                        margin_pixels, view_top=0):
+        # Cheap test on the unrotated bounds, before any rotation.
+        # The band runs from view_top to view_height in screen
+        # pixels; view_top is negative when the view is zoomed out.
+        screen_center_y = self.get_screen_center_y(camera_world_y)
+        reach = self.max_half_extent_pixels + margin_pixels
+        return view_top - reach < screen_center_y < view_height + reach
+
     def update_screen_rects(self, camera_world_y):
+        self.refresh_image()
         screen_center_x = round(self.world_x * self.world_unit_scale)
         screen_center_y = round(
             (self.world_y - camera_world_y) * self.world_unit_scale
@@ -212,84 +305,156 @@ class BotCar:
 
         # Update image_rect using the center of the current
         # (possibly rotated) image
-        self.image_rect = self.image.get_rect(
-            center=(screen_center_x, screen_center_y)
-        )
+        if self.image_area is None:
+            self.image_rect = self.image.get_rect(
+                center=(screen_center_x, screen_center_y)
+            )
+        else:
+            self.image_rect = pygame.Rect((0, 0), self.image_area.size)
+            self.image_rect.center = (screen_center_x, screen_center_y)
 
         # Now that image_rect is correctly positioned,
         # update collision_rect based on it.
         self._update_collision_rect_from_image_rect()
 
-    def update(self, delta_time):
-        self.time_alive += delta_time
-        self.current_y_velocity_world = self.base_y_velocity_world
-
-        previous_world_x = self.world_x
-        previous_world_y = self.world_y
-
+    def get_world_position(self, time_alive):
+        """
+        (world_x, world_y) time_alive seconds after spawn, in closed
+        form, so it doesn't depend on the frame rate.
+        """
+        t = time_alive
+        if self.movement_type == 'donut':
+            angle = self.donut_start_angle + self.donut_angular_speed * t
+            center_y = (self.initial_world_y +
+                        self.donut_drift_y_speed_world * t)
+            return (
+                self.donut_center_x_world +
+                self.donut_radius_world * math.cos(angle),
+                center_y + self.donut_radius_world * math.sin(angle)
+            )
+        world_y = self.initial_world_y + self.base_y_velocity_world * t
         if self.movement_type == 'sine_speed':
-            speed_factor = (
-                self.base_y_velocity_world *
-                self.sine_amp_speed_factor
+            # Integral of b * (1 + a * sin(f * t)); a < 1, so the
+            # speed never drops to zero
+            world_y += (
+                self.base_y_velocity_world * self.sine_amp_speed_factor *
+                (1.0 - math.cos(self.sine_freq * t)) / self.sine_freq
             )
-            sine_val = math.sin(self.sine_freq * self.time_alive)
-            speed_offset = speed_factor * sine_val
-            self.current_y_velocity_world = (
-                self.base_y_velocity_world + speed_offset
+        world_x = self.spawn_world_x
+        if 'sine_steer' in self.movement_type:
+            world_x = (self.initial_world_x + self.sine_amp_steer_world *
+                       math.sin(self.sine_freq * t))
+        elif 'curve' in self.movement_type:
+            world_x += self.curve_steer_rate_world * t
+        return world_x, world_y
+
+    def get_world_velocity(self, time_alive):
+        # (dx/dt, dy/dt) of get_world_position, in world units/sec
+        t = time_alive
+        if self.movement_type == 'donut':
+            angle = self.donut_start_angle + self.donut_angular_speed * t
+            turn_speed = self.donut_radius_world * self.donut_angular_speed
+            return (
+                -turn_speed * math.sin(angle),
+                self.donut_drift_y_speed_world +
+                turn_speed * math.cos(angle)
             )
-            self.current_y_velocity_world = max(
-                0, self.current_y_velocity_world
+        velocity_y = self.base_y_velocity_world
+        velocity_x = 0.0
+        if self.movement_type == 'sine_speed':
+            velocity_y += (
+                self.base_y_velocity_world * self.sine_amp_speed_factor *
+                math.sin(self.sine_freq * t)
             )
         elif 'sine_steer' in self.movement_type:
-            sine_val_steer = math.sin(self.sine_freq * self.time_alive)
-            self.world_x = (
-                self.initial_world_x +
-                self.sine_amp_steer_world * sine_val_steer
-            )
+            velocity_x = (self.sine_amp_steer_world * self.sine_freq *
+                          math.cos(self.sine_freq * t))
         elif 'curve' in self.movement_type:
-            self.world_x += self.curve_steer_rate_world * delta_time
-        elif self.movement_type == 'donut':
-            self.donut_current_angle += (
-                self.donut_angular_speed * delta_time
-            )
-            self.donut_center_y_world += (
-                self.donut_drift_y_speed_world * delta_time
-            )
-            cos_angle = math.cos(self.donut_current_angle)
-            sin_angle = math.sin(self.donut_current_angle)
-            self.world_x = (
-                self.donut_center_x_world +
-                self.donut_radius_world * cos_angle
-            )
-            self.world_y = (
-                self.donut_center_y_world +
-                self.donut_radius_world * sin_angle
-            )
-            self.current_y_velocity_world = (
-                self.donut_drift_y_speed_world
-            )
+            velocity_x = self.curve_steer_rate_world
+        return velocity_x, velocity_y
 
-        if self.movement_type != 'donut':
-            self.world_y += (
-                self.current_y_velocity_world * delta_time
-            )
+    def get_heading(self, time_alive):
+        """
+        angle_visual (degrees clockwise from straight up) of the
+        direction of travel at time_alive, or None when not moving.
+        """
+        velocity_x, velocity_y = self.get_world_velocity(time_alive)
+        if velocity_x == 0 and velocity_y == 0:
+            return None
+        return math.degrees(math.atan2(velocity_x, -velocity_y))
 
-        dx = self.world_x - previous_world_x
-        dy = self.world_y - previous_world_y
+    def shift_world_y(self, delta_world_y):
+        # Moves the whole trajectory by delta_world_y
+        self.initial_world_y += delta_world_y
+        self.world_y += delta_world_y
+        self.previous_world_y += delta_world_y
 
-        if abs(dx) > 0.001 or abs(dy) > 0.001:
-            angle_from_up_rad = math.atan2(dx, -dy)
-            self.angle_visual = math.degrees(angle_from_up_rad)
+    def update(self, delta_time):
+        self.time_alive += delta_time
+        self.previous_world_x = self.world_x
+        self.previous_world_y = self.world_y
+        self._move_to_time_alive()
 
-        self.image = pygame.transform.rotozoom(
-            self.image_original_scaled, -self.angle_visual, 1.0
-        )
+    def move_to_time(self, time_alive, delta_time):
+        """
+        Puts the bot where update() calls delta_time apart would have
+        left it at time_alive. BotFleet only tracks the y of its
+        bots, and uses this to bring one up to date when needed.
+        """
+        self.time_alive = time_alive
+        self.previous_world_x, self.previous_world_y = (
+            self.get_world_position(max(0.0, time_alive - delta_time)))
+        self._move_to_time_alive()
+
+    def _move_to_time_alive(self):
+        self.world_x, self.world_y = self.get_world_position(
+            self.time_alive)
+        self.current_y_velocity_world = self.get_world_velocity(
+            self.time_alive)[1]
+
+        new_angle_visual = self.get_heading(self.time_alive)
+        if new_angle_visual is not None:
+            if (self.rotation_cache.angle_index(-new_angle_visual) !=
+                    self.rotation_cache.angle_index(-self.angle_visual)):
+                self.image_dirty = True
+            self.angle_visual = new_angle_visual
+
+    def get_blit(self, camera_world_y, view_height, view_zoom=None):
+        # (image, topleft, area) for Surface.blits, or None when off
+        # screen. Positions like update_screen_rects without building
+        # any Rects; collision_rect is left alone. With a zoomed
+        # view_zoom the frame comes pre-scaled for its level.
+        if view_zoom is None or not view_zoom.is_zoomed():
+            self.refresh_image()
+            image, area = self.image, self.image_area
+            center_x = round(self.world_x * self.world_unit_scale)
+            center_y = self.get_screen_center_y(camera_world_y)
+        else:
+            image, area = self.rotation_cache.get_frame(
+                self.image_original_scaled, -self.angle_visual,
+                view_zoom.zoom
+            )
+            center_x, center_y = view_zoom.to_screen(
+                self.world_x * self.world_unit_scale,
+                (self.world_y - camera_world_y) * self.world_unit_scale
+            )
+            center_x = round(center_x)
+            center_y = round(center_y)
+        if area is None:
+            width, height = image.get_size()
+        else:
+            width, height = area.size
+        top = center_y - height // 2
+        if top + height <= 0 or top >= view_height:
+            return None
+        return image, (center_x - width // 2, top), area
 
     def draw(self, surface, camera_world_y):
         self.update_screen_rects(camera_world_y)
         if (self.image_rect.bottom > 0 and
                 self.image_rect.top < surface.get_height()):
-            surface.blit(self.image, self.image_rect.topleft)
+            surface.blit(self.image, self.image_rect.topleft,
+                         self.image_area)
             # Debug collision
             # pygame.draw.rect(surface, (0,0,255),
             #                  self.collision_rect, 1)
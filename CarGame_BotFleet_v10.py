@@ -0,0 +1,184 @@
+try:
+    import numpy
+except ImportError:  # BotManager falls back to BotCar.update()
+    numpy = None
+
+# How a bot's world_y moves; the nine BotCar movement types only
+# differ in y in these three ways (steering only changes x)
+BOT_MOTION_LINEAR = 0
+BOT_MOTION_SINE_SPEED = 1
+BOT_MOTION_DONUT = 2
+
+BOT_FLEET_INITIAL_CAPACITY = 64
+
+# BotCar attributes the fleet keeps per row: what step() changes,
+# then what the closed-form world_y needs
+BOT_FLEET_STATE_FIELDS = ('world_y', 'previous_world_y', 'time_alive')
+BOT_FLEET_PARAMETER_FIELDS = (
+    'base_y_velocity_world', 'initial_world_y', 'sine_freq',
+    'sine_amp_speed_factor', 'donut_radius_world',
+    'donut_angular_speed', 'donut_start_angle',
+    'donut_drift_y_speed_world', 'max_half_extent_pixels',
+)
+
+
+def get_motion_kind(movement_type):
+    if movement_type == 'sine_speed':
+        return BOT_MOTION_SINE_SPEED
+    if movement_type == 'donut':
+        return BOT_MOTION_DONUT
+    return BOT_MOTION_LINEAR
+
+
+class BotFleet:
+    """
+    Movement of every bot at once. Each BotCar field the fleet needs
+    is one NumPy array with a row per bot.
+
+    Every step only time_alive and world_y are evaluated for all
+    bots, in one masked array step of the closed form in
+    BotCar.get_world_position(): that is all the pass, cull and band
+    tests read. The BotCar objects go stale meanwhile; sync() moves
+    the bots BotManager is about to draw or collision-test to their
+    current time_alive, so x, velocity and heading are only worked
+    out for those. Requires NumPy.
+    """
+
+    def __init__(self, world_unit_scale):
+        self.world_unit_scale = world_unit_scale
+        self.bots = []  # BotCar per row
+        self.count = 0
+        self.capacity = 0
+        self.last_delta_time = 0.0
+        self.float_fields = (BOT_FLEET_STATE_FIELDS +
+                             BOT_FLEET_PARAMETER_FIELDS +
+                             ('half_height_world',))
+        self._allocate(BOT_FLEET_INITIAL_CAPACITY)
+
+    def __len__(self):
+        return self.count
+
+    def _allocate(self, capacity):
+        # (Re)allocates every column, keeping the first count rows
+        columns = [(name, numpy.float64) for name in self.float_fields]
+        columns += [('motion_kind', numpy.int8),
+                    ('passed_by_player', numpy.bool_)]
+        for name, dtype in columns:
+            column = numpy.zeros(capacity, dtype=dtype)
+            if self.count:
+                column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def clear(self):
+        self.bots = []
+        self.count = 0
+
+    def add(self, bot):
+        # Takes over moving bot from now on
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        row = self.count
+        for name in (BOT_FLEET_STATE_FIELDS +
+                     BOT_FLEET_PARAMETER_FIELDS):
+            getattr(self, name)[row] = getattr(bot, name)
+        self.half_height_world[row] = (
+            bot.image_original_scaled.get_height() /
+            self.world_unit_scale / 2.0
+        )
+        self.motion_kind[row] = get_motion_kind(bot.movement_type)
+        self.passed_by_player[row] = bot.passed_by_player
+        self.bots.append(bot)
+        self.count += 1
+
+    def step(self, delta_time):
+        """
+        Advances every bot by delta_time, evaluating world_y only;
+        see sync() for the rest of BotCar.update().
+        """
+        self.last_delta_time = delta_time
+        n = self.count
+        if n == 0:
+            return
+        kind = self.motion_kind[:n]
+        time_alive = self.time_alive[:n]
+        time_alive += delta_time
+        world_y = self.world_y[:n]
+        self.previous_world_y[:n] = world_y
+
+        # Straight along y at the base speed, adjusted per kind
+        # below; see BotCar.get_world_position
+        world_y[:] = (self.initial_world_y[:n] +
+                      self.base_y_velocity_world[:n] * time_alive)
+
+        sine_speed = kind == BOT_MOTION_SINE_SPEED
+        sine_freq = self.sine_freq[:n][sine_speed]
+        world_y[sine_speed] += (
+            self.base_y_velocity_world[:n][sine_speed] *
+            self.sine_amp_speed_factor[:n][sine_speed] *
+            (1.0 - numpy.cos(sine_freq * time_alive[sine_speed])) /
+            sine_freq
+        )
+
+        donut = kind == BOT_MOTION_DONUT
+        donut_time = time_alive[donut]
+        donut_angle = (self.donut_start_angle[:n][donut] +
+                       self.donut_angular_speed[:n][donut] * donut_time)
+        world_y[donut] = (
+            self.initial_world_y[:n][donut] +
+            self.donut_drift_y_speed_world[:n][donut] * donut_time +
+            self.donut_radius_world[:n][donut] * numpy.sin(donut_angle)
+        )
+
+    def mark_passed(self, player_world_y):
+        # Flags bots the player has just got ahead of; returns how
+        # many
+        n = self.count
+        newly_passed = (~self.passed_by_player[:n] &
+                        (player_world_y < self.world_y[:n]))
+        self.passed_by_player[:n] |= newly_passed
+        rows = numpy.flatnonzero(newly_passed)
+        for row in rows:
+            self.bots[row].passed_by_player = True
+        return len(rows)
+
+    def cull(self, cull_line_world_y):
+        # Drops bots whose top edge is behind cull_line_world_y
+        n = self.count
+        keep = (self.world_y[:n] - self.half_height_world[:n] <
+                cull_line_world_y)
+        if keep.all():
+            return
+        rows = numpy.flatnonzero(keep)
+        for name in self.float_fields + ('motion_kind',
+                                         'passed_by_player'):
+            column = getattr(self, name)
+            column[:len(rows)] = column[rows]
+        self.bots = [self.bots[row] for row in rows]
+        self.count = len(rows)
+
+    def sync(self, rows):
+        # Moves the bots in the given rows to their current time_alive
+        for row in rows:
+            self.bots[row].move_to_time(float(self.time_alive[row]),
+                                        self.last_delta_time)
+
+    def select_in_band(self, camera_world_y, band_top, band_bottom,
+                       margin_pixels, include_motion=False):
+        """
+        Synced bots whose sprite, grown by margin_pixels (and by the
+        last step's vertical motion with include_motion), may reach
+        into screen rows band_top to band_bottom; in fleet order.
+        """
+        n = self.count
+        center_y = numpy.round(
+            (self.world_y[:n] - camera_world_y) * self.world_unit_scale)
+        reach = self.max_half_extent_pixels[:n] + margin_pixels
+        if include_motion:
+            reach = reach + numpy.abs(
+                self.world_y[:n] - self.previous_world_y[:n]
+            ) * self.world_unit_scale
+        rows = numpy.flatnonzero((center_y > band_top - reach) &
+                                 (center_y < band_bottom + reach))
+        self.sync(rows)
+        return [self.bots[row] for row in rows]
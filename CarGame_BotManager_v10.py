@@ -1,17 +1,33 @@
+import math
 import random
 from CarGame_BotCar_v10 import BotCar
+from CarGame_BotFleet_v10 import BotFleet, numpy
+from CarGame_RenderList_v10 import RenderList
+from CarGame_Collision_v10 import (
+    COLLISION_MODE_RECTS, COLLISION_MODE_MASKS, COLLISION_MODE_OBB,
+    masks_overlap, obb_overlaps_any, obbs_overlap_swept,
+    obbs_passed_through, rect_to_obb
+)
 
 # Further ahead for more reaction time
 BOT_SPAWN_DISTANCE_AHEAD_FACTOR = 0.7
 BOT_SPAWN_ZONE_DEPTH_FACTOR = 2.0
 BOT_CULL_DISTANCE_BEHIND_FACTOR = 0.6
 TARGET_BOTS_PER_Y_WORLD_DISTANCE = 12.0  # Spawn a bit more
+# Bots this far outside the screen still get their image rotated
+BOT_VISIBILITY_MARGIN_PIXELS = 50
+# Fleet bots picked for collision tests: one pixel beyond the
+# broadphase reach used there
+BOT_COLLISION_MARGIN_PIXELS = 2
 
 
 class BotManager:
     def __init__(self, screen_width_pixels, screen_height_pixels,
                  world_unit_scale,
-                 player_max_speed_world, player_car_scale_factor):
+                 player_max_speed_world, player_car_scale_factor,
+                 asset_manager, collision_mode=COLLISION_MODE_RECTS,
+                 swept_collisions=False, vectorized_updates=False,
+                 view_top_pixels=0):
         self.bot_cars = []
         self.screen_width_pixels = screen_width_pixels
         self.screen_height_pixels = screen_height_pixels
@@ -26,16 +42,48 @@ class BotManager:
 
         self.player_max_speed_world = player_max_speed_world
         self.player_car_scale_factor = player_car_scale_factor
+        self.asset_manager = asset_manager
+        self.collision_mode = collision_mode
+        # Test the whole motion over each step, not just where the
+        # cars end up
+        self.swept_collisions = swept_collisions
+        # Move all bots as NumPy arrays instead of one BotCar.update()
+        # each; needs NumPy, otherwise bots update themselves
+        self.bot_fleet = None
+        if vectorized_updates and numpy is not None:
+            self.bot_fleet = BotFleet(world_unit_scale)
+            self.bot_cars = self.bot_fleet.bots
+
+        # Top row of the widest (zoomed-out) view, negative when
+        # zoomed out; new bots start above it
+        self.view_top_pixels = view_top_pixels
 
         self.last_camera_y_for_spawn_check = 0.0
         self.accumulated_camera_dy_world = 0.0
 
+        # Per-frame counters: images re-rotated vs. bots updated
+        # (every updated bot used to be rotated every frame)
+        self.rotations_this_frame = 0
+        self.bots_updated_this_frame = 0
+
     def reset(self):
         self.bot_cars = []
+        if self.bot_fleet is not None:
+            self.bot_fleet.clear()
+            self.bot_cars = self.bot_fleet.bots
         self.last_camera_y_for_spawn_check = 0.0
         self.accumulated_camera_dy_world = 0.0
+        self.rotations_this_frame = 0
+        self.bots_updated_this_frame = 0
+
+    def get_rotation_stats(self):
+        return {
+            'rotations': self.rotations_this_frame,
+            'avoided': (self.bots_updated_this_frame -
+                        self.rotations_this_frame),
+        }
 
-    def _spawn_bot_car(self, target_world_y):
+    def _spawn_bot_car(self, target_world_y, camera_world_y):
         # Default spawn X to be somewhat central, BotCar init can
         # override for specific types
         # A bit narrower for general spawn
@@ -54,14 +102,32 @@ class BotManager:
             self.world_unit_scale,
             self.player_max_speed_world,
             self.player_car_scale_factor,
-            self.screen_width_world  # Added screen_width_world
+            self.screen_width_world,  # Added screen_width_world
+            self.asset_manager
         )
-        self.bot_cars.append(new_bot)
+        # Keep the whole sprite, and the margin it gets rotated in,
+        # above even the widest view
+        spawn_limit_world_y = camera_world_y + (
+            self.view_top_pixels - BOT_VISIBILITY_MARGIN_PIXELS -
+            new_bot.max_half_extent_pixels
+        ) / self.world_unit_scale
+        if new_bot.world_y > spawn_limit_world_y:
+            new_bot.shift_world_y(spawn_limit_world_y - new_bot.world_y)
+        if self.bot_fleet is not None:
+            # bot_cars is the fleet's own list
+            self.bot_fleet.add(new_bot)
+        else:
+            self.bot_cars.append(new_bot)
 
     def update_bots(self, delta_time, camera_world_y,
                     player_car_world_y_center):
-        for bot in self.bot_cars:
-            bot.update(delta_time)
+        self.rotations_this_frame = 0
+        self.bots_updated_this_frame = len(self.bot_cars)
+        if self.bot_fleet is not None:
+            self.bot_fleet.step(delta_time)
+        else:
+            for bot in self.bot_cars:
+                bot.update(delta_time)
 
         if (self.last_camera_y_for_spawn_check == 0.0 and
                 camera_world_y != 0.0):
@@ -96,9 +162,24 @@ class BotManager:
                 )
                 spawn_y_offset = spawn_offset_base + random_depth_offset
                 actual_spawn_y = camera_world_y - spawn_y_offset
-                self._spawn_bot_car(actual_spawn_y)
+                self._spawn_bot_car(actual_spawn_y, camera_world_y)
             self.accumulated_camera_dy_world %= target_dist
 
+        cull_offset = (
+            self.screen_height_world *
+            BOT_CULL_DISTANCE_BEHIND_FACTOR
+        )
+        cull_line_world_y = (
+            camera_world_y + self.screen_height_world +
+            cull_offset
+        )
+        if self.bot_fleet is not None:
+            score_increment += self.bot_fleet.mark_passed(
+                player_car_world_y_center)
+            self.bot_fleet.cull(cull_line_world_y)
+            self.bot_cars = self.bot_fleet.bots
+            return score_increment
+
         active_bots = []
         for bot in self.bot_cars:
             if (not bot.passed_by_player and
@@ -109,14 +190,6 @@ class BotManager:
             bot_img_h = bot.image_original_scaled.get_height()
             bot_visual_height_world = bot_img_h / self.world_unit_scale
 
-            cull_offset = (
-                self.screen_height_world *
-                BOT_CULL_DISTANCE_BEHIND_FACTOR
-            )
-            cull_line_world_y = (
-                camera_world_y + self.screen_height_world +
-                cull_offset
-            )
             bot_top_y = bot.world_y - bot_visual_height_world / 2.0
             if bot_top_y < cull_line_world_y:
                 active_bots.append(bot)
@@ -124,16 +197,145 @@ class BotManager:
 
         return score_increment
 
+    def _bots_in_band(self, camera_world_y, band_top, band_bottom,
+                      margin_pixels, include_motion=False):
+        # Bots that may reach screen rows band_top to band_bottom.
+        # Fleet bots are picked in one array test and only those get
+        # their movement state synced; otherwise every bot is
+        # returned for the caller's own per-bot test.
+        if self.bot_fleet is None:
+            return self.bot_cars
+        return self.bot_fleet.select_in_band(
+            camera_world_y, band_top, band_bottom, margin_pixels,
+            include_motion
+        )
+
+    def _check_player_collision_obb(self, player_car, camera_world_y):
+        player_obb = player_car.get_obb(camera_world_y,
+                                        self.world_unit_scale)
+        player_reach = math.hypot(player_obb[2], player_obb[3])
+        player_motion = None
+        if self.swept_collisions:
+            player_motion = player_car.get_screen_motion(
+                self.world_unit_scale)
+            player_reach += abs(player_motion[1])
+        candidate_obbs = []
+        candidate_motions = []
+        for bot in self._bots_in_band(
+                camera_world_y, player_obb[1] - player_reach,
+                player_obb[1] + player_reach,
+                BOT_COLLISION_MARGIN_PIXELS, self.swept_collisions):
+            # Same vertical broadphase as the rect path; no bot image
+            # is needed at all
+            bot_center_y = bot.get_screen_center_y(camera_world_y)
+            bot_reach = (
+                bot.max_half_extent_pixels *
+                bot.bot_collision_rect_scale_factor + 1
+            )
+            if self.swept_collisions:
+                bot_motion = bot.get_screen_motion()
+                bot_reach += abs(bot_motion[1])
+            if (abs(bot_center_y - player_obb[1]) >
+                    player_reach + bot_reach):
+                continue
+            candidate_obbs.append(bot.get_obb(camera_world_y))
+            if self.swept_collisions:
+                candidate_motions.append(bot_motion)
+        return obb_overlaps_any(player_obb, candidate_obbs,
+                                player_motion, candidate_motions)
+
     def check_player_collision(self, player_car, camera_world_y):
         if not player_car:
             return False
-        for bot in self.bot_cars:
+        if self.collision_mode == COLLISION_MODE_OBB:
+            return self._check_player_collision_obb(player_car,
+                                                    camera_world_y)
+        use_masks = self.collision_mode == COLLISION_MODE_MASKS
+        if use_masks:
+            # Masks cover the whole sprite, so the rect test has to
+            # as well
+            player_rect = player_car.image_rect
+            player_mask = None
+        else:
+            player_rect = player_car.collision_rect
+        player_motion_y = 0.0
+        if self.swept_collisions:
+            player_motion = player_car.get_screen_motion(
+                self.world_unit_scale)
+            player_motion_y = abs(player_motion[1])
+        for bot in self._bots_in_band(
+                camera_world_y, player_rect.top - player_motion_y,
+                player_rect.bottom + player_motion_y,
+                BOT_COLLISION_MARGIN_PIXELS, self.swept_collisions):
+            # Broadphase on the bot's largest possible collision
+            # rect, so far-away bots are never rotated
+            bot_reach = bot.max_half_extent_pixels + 1
+            if not use_masks:
+                bot_reach = (
+                    bot.max_half_extent_pixels *
+                    bot.bot_collision_rect_scale_factor + 1
+                )
+            if self.swept_collisions:
+                # Widened by how far both cars moved this step
+                bot_motion = bot.get_screen_motion()
+                bot_reach += abs(bot_motion[1]) + abs(player_motion[1])
+            bot_center_y = bot.get_screen_center_y(camera_world_y)
+            if (bot_center_y + bot_reach < player_rect.top or
+                    bot_center_y - bot_reach > player_rect.bottom):
+                continue
+            if bot.refresh_image():
+                self.rotations_this_frame += 1
             bot.update_screen_rects(camera_world_y)
-            if player_car.collision_rect.colliderect(
-                    bot.collision_rect):
+            if not use_masks:
+                if self.swept_collisions:
+                    if obbs_overlap_swept(
+                            rect_to_obb(player_rect), player_motion,
+                            rect_to_obb(bot.collision_rect), bot_motion):
+                        return True
+                elif player_rect.colliderect(bot.collision_rect):
+                    return True
+                continue
+            if player_rect.colliderect(bot.image_rect):
+                # Rects overlap: compare the actual pixels
+                if player_mask is None:
+                    player_mask = player_car.get_mask()
+                if masks_overlap(player_mask, player_rect,
+                                 bot.get_mask(), bot.image_rect):
+                    return True
+            # Masks only see where the cars ended up; catch cars
+            # that went right through each other with their boxes
+            if self.swept_collisions and obbs_passed_through(
+                    player_car.get_obb(camera_world_y,
+                                       self.world_unit_scale),
+                    player_motion,
+                    bot.get_obb(camera_world_y), bot_motion):
                 return True
         return False
 
+    def submit_draw_calls(self, render_list, camera_world_y,
+                          view_height, view_zoom=None):
+        # A zoomed-out view shows bots from above and beside the
+        # unzoomed screen; zoomed frames come from the rotation cache
+        # directly, without touching each bot's own image
+        zoomed = view_zoom is not None and view_zoom.is_zoomed()
+        band_top, band_bottom = 0, view_height
+        if zoomed:
+            _, band_top, _, band_bottom = view_zoom.get_base_bounds()
+        for bot in self._bots_in_band(camera_world_y, band_top,
+                                      band_bottom,
+                                      BOT_VISIBILITY_MARGIN_PIXELS):
+            if not bot.is_in_view_band(camera_world_y, band_bottom,
+                                       BOT_VISIBILITY_MARGIN_PIXELS,
+                                       band_top):
+                continue
+            if bot.image_dirty and not zoomed:
+                self.rotations_this_frame += 1
+            blit = bot.get_blit(camera_world_y, view_height, view_zoom)
+            if blit is not None:
+                render_list.add_blit(*blit)
+
     def draw_all(self, surface, camera_world_y):
-        for bot in self.bot_cars:
-            bot.draw(surface, camera_world_y)
+        render_list = RenderList()
+        self.submit_draw_calls(render_list, camera_world_y,
+                               surface.get_height())
+        render_list.flush(surface)
@@ -0,0 +1,72 @@
+import queue
+import threading
+
+
+class ChunkPrefetcher:
+    """
+    Renders background chunks on a worker thread ahead of the
+    camera. request() and collect() are called from the main loop
+    and never wait on the worker.
+    """
+
+    def __init__(self, render_chunk):
+        # render_chunk(chunk_index) -> surface; must be safe to call
+        # off the main thread
+        self.render_chunk = render_chunk
+        self.requests = queue.Queue()
+        self.finished = queue.Queue()
+        self.pending = set()  # Only touched by the main thread
+
+        self.worker = threading.Thread(
+            target=self._run, name="ChunkPrefetcher", daemon=True
+        )
+        self.worker.start()
+
+    def _run(self):
+        while True:
+            request = self.requests.get()
+            if request is None:  # Shutdown sentinel
+                return
+            chunk_index, generation = request
+            chunk_surface = self.render_chunk(chunk_index)
+            self.finished.put((chunk_index, generation, chunk_surface))
+
+    def request(self, chunk_index, generation=0):
+        # generation is handed back with the result, so the caller
+        # can tell chunks rendered before a change (e.g. of palette)
+        request = (chunk_index, generation)
+        if request in self.pending:
+            return
+        self.pending.add(request)
+        self.requests.put(request)
+
+    def collect(self):
+        # Returns the (chunk_index, generation, surface) triples
+        # finished so far
+        ready_chunks = []
+        while True:
+            try:
+                ready_chunk = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            self.pending.discard(ready_chunk[:2])
+            ready_chunks.append(ready_chunk)
+        return ready_chunks
+
+    def cancel(self):
+        # Drops every queued request, so nothing waits on them and
+        # they can be made again; the chunk the worker is on still
+        # comes back through collect()
+        while True:
+            try:
+                self.requests.get_nowait()
+            except queue.Empty:
+                break
+        self.pending.clear()
+
+    def close(self):
+        # The worker stops after the chunk it's on, instead of
+        # rendering the rest of the queue for nothing
+        self.cancel()
+        self.requests.put(None)
+        self.worker.join(timeout=1.0)
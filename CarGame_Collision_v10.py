@@ -0,0 +1,247 @@
+import math
+import pygame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Collision modes
+# Axis-aligned collision_rects, shrunk to roughly fit the car body
+COLLISION_MODE_RECTS = "rects"
+# Exact: per-pixel masks of the rotated sprites, tested only after
+# their bounding rects overlap
+COLLISION_MODE_MASKS = "masks"
+# Oriented bounding boxes that turn with the cars, tested with the
+# separating-axis theorem
+COLLISION_MODE_OBB = "obb"
+
+# From this many candidates on, OBB tests run as one NumPy batch
+OBB_VECTORIZE_MIN_CANDIDATES = 8
+
+# An OBB is a tuple (center_x, center_y, half_width, half_length,
+# angle) in screen pixels. angle is in radians, clockwise from
+# straight up like the cars' heading; half_length runs along it.
+# Swept tests take each box where it ends the step plus its motion
+# (dx, dy) over the step, and report contact anywhere along the way.
+# The boxes keep their end-of-step angles for the whole step.
+
+
+def masks_overlap(mask_a, rect_a, mask_b, rect_b):
+    """
+    True if any solid pixels of the two masks touch, with each mask
+    placed at the topleft of its screen rect.
+    """
+    if not rect_a.colliderect(rect_b):
+        return False
+    offset = (rect_b.x - rect_a.x, rect_b.y - rect_a.y)
+    return mask_a.overlap(mask_b, offset) is not None
+
+
+def mask_overlaps_rect(mask, mask_rect, rect):
+    """
+    True if any solid pixel of mask (placed at mask_rect) lies
+    inside the fully solid rect.
+    """
+    overlap_rect = mask_rect.clip(rect)
+    if overlap_rect.width == 0 or overlap_rect.height == 0:
+        return False
+    solid = pygame.Mask(overlap_rect.size, fill=True)
+    offset = (overlap_rect.x - mask_rect.x,
+              overlap_rect.y - mask_rect.y)
+    return mask.overlap(solid, offset) is not None
+
+
+def _obb_axes(angle):
+    # Unit vectors along the box's width and length
+    cos_angle = math.cos(angle)
+    sin_angle = math.sin(angle)
+    return (cos_angle, sin_angle), (sin_angle, -cos_angle)
+
+
+def obbs_overlap(obb_a, obb_b):
+    """
+    Separating-axis test for two OBBs: they overlap unless their
+    projections are apart on one of the four edge axes.
+    """
+    center_ax, center_ay, half_wa, half_la, angle_a = obb_a
+    center_bx, center_by, half_wb, half_lb, angle_b = obb_b
+    width_a, length_a = _obb_axes(angle_a)
+    width_b, length_b = _obb_axes(angle_b)
+    offset_x = center_bx - center_ax
+    offset_y = center_by - center_ay
+    for axis_x, axis_y in (width_a, length_a, width_b, length_b):
+        reach_a = (
+            half_wa * abs(width_a[0] * axis_x + width_a[1] * axis_y) +
+            half_la * abs(length_a[0] * axis_x + length_a[1] * axis_y)
+        )
+        reach_b = (
+            half_wb * abs(width_b[0] * axis_x + width_b[1] * axis_y) +
+            half_lb * abs(length_b[0] * axis_x + length_b[1] * axis_y)
+        )
+        if abs(offset_x * axis_x + offset_y * axis_y) > reach_a + reach_b:
+            return False
+    return True
+
+
+def rect_to_obb(rect):
+    # Axis-aligned pygame.Rect as an unrotated OBB
+    return (rect.centerx, rect.centery,
+            rect.width / 2, rect.height / 2, 0.0)
+
+
+def _axis_contact_interval(offset, motion, reach):
+    """
+    Times s in [0, 1] of the step's end-to-start reversal where the
+    projected centre distance offset - motion * s is within reach,
+    as (enter, leave); enter > leave means never.
+    """
+    if motion == 0:
+        if abs(offset) > reach:
+            return 1.0, 0.0
+        return 0.0, 1.0
+    enter = (offset - reach) / motion
+    leave = (offset + reach) / motion
+    if enter > leave:
+        enter, leave = leave, enter
+    return max(enter, 0.0), min(leave, 1.0)
+
+
+def obbs_overlap_swept(obb_a, motion_a, obb_b, motion_b):
+    """
+    True if the two boxes touch at any point of a step that ended
+    with them at obb_a / obb_b after moving by motion_a / motion_b.
+    Catches boxes that passed through each other within the step.
+    """
+    center_ax, center_ay, half_wa, half_la, angle_a = obb_a
+    center_bx, center_by, half_wb, half_lb, angle_b = obb_b
+    width_a, length_a = _obb_axes(angle_a)
+    width_b, length_b = _obb_axes(angle_b)
+    offset_x = center_bx - center_ax
+    offset_y = center_by - center_ay
+    # B's motion relative to A; walking back from the end by s of
+    # the step moves the offset by -motion * s
+    motion_x = motion_b[0] - motion_a[0]
+    motion_y = motion_b[1] - motion_a[1]
+    first_contact = 0.0
+    last_contact = 1.0
+    for axis_x, axis_y in (width_a, length_a, width_b, length_b):
+        reach = (
+            half_wa * abs(width_a[0] * axis_x + width_a[1] * axis_y) +
+            half_la * abs(length_a[0] * axis_x + length_a[1] * axis_y) +
+            half_wb * abs(width_b[0] * axis_x + width_b[1] * axis_y) +
+            half_lb * abs(length_b[0] * axis_x + length_b[1] * axis_y)
+        )
+        enter, leave = _axis_contact_interval(
+            offset_x * axis_x + offset_y * axis_y,
+            motion_x * axis_x + motion_y * axis_y, reach
+        )
+        first_contact = max(first_contact, enter)
+        last_contact = min(last_contact, leave)
+        if first_contact > last_contact:
+            return False
+    return True
+
+
+def obbs_passed_through(obb_a, motion_a, obb_b, motion_b):
+    """
+    True if the boxes touched during the step but are apart at its
+    end, i.e. one skipped through the other between frames.
+    """
+    return (obbs_overlap_swept(obb_a, motion_a, obb_b, motion_b) and
+            not obbs_overlap(obb_a, obb_b))
+
+
+def _obbs_overlap_numpy(obb, obbs):
+    # obbs_overlap of one OBB against every row of an (N, 5) array
+    center_ax, center_ay, half_wa, half_la, angle_a = obb
+    center_bx, center_by, half_wb, half_lb, angle_b = obbs.T
+    (wa_x, wa_y), (la_x, la_y) = _obb_axes(angle_a)
+    wb_x = numpy.cos(angle_b)
+    wb_y = numpy.sin(angle_b)
+    lb_x = wb_y
+    lb_y = -wb_x
+    offset_x = center_bx - center_ax
+    offset_y = center_by - center_ay
+
+    separated = numpy.zeros(len(obbs), dtype=bool)
+    for axis_x, axis_y in ((wa_x, wa_y), (la_x, la_y),
+                           (wb_x, wb_y), (lb_x, lb_y)):
+        reach_a = (half_wa * numpy.abs(wa_x * axis_x + wa_y * axis_y) +
+                   half_la * numpy.abs(la_x * axis_x + la_y * axis_y))
+        reach_b = (half_wb * numpy.abs(wb_x * axis_x + wb_y * axis_y) +
+                   half_lb * numpy.abs(lb_x * axis_x + lb_y * axis_y))
+        separated |= (numpy.abs(offset_x * axis_x + offset_y * axis_y) >
+                      reach_a + reach_b)
+    return ~separated
+
+
+def _obbs_overlap_swept_numpy(obb, motion, obbs, motions):
+    # obbs_overlap_swept of one OBB against rows of (N, 5) and
+    # (N, 2) arrays
+    center_ax, center_ay, half_wa, half_la, angle_a = obb
+    center_bx, center_by, half_wb, half_lb, angle_b = obbs.T
+    (wa_x, wa_y), (la_x, la_y) = _obb_axes(angle_a)
+    wb_x = numpy.cos(angle_b)
+    wb_y = numpy.sin(angle_b)
+    lb_x = wb_y
+    lb_y = -wb_x
+    offset_x = center_bx - center_ax
+    offset_y = center_by - center_ay
+    motion_x = motions[:, 0] - motion[0]
+    motion_y = motions[:, 1] - motion[1]
+
+    first_contact = numpy.zeros(len(obbs))
+    last_contact = numpy.ones(len(obbs))
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        for axis_x, axis_y in ((wa_x, wa_y), (la_x, la_y),
+                               (wb_x, wb_y), (lb_x, lb_y)):
+            reach = (
+                half_wa * numpy.abs(wa_x * axis_x + wa_y * axis_y) +
+                half_la * numpy.abs(la_x * axis_x + la_y * axis_y) +
+                half_wb * numpy.abs(wb_x * axis_x + wb_y * axis_y) +
+                half_lb * numpy.abs(lb_x * axis_x + lb_y * axis_y)
+            )
+            offset = offset_x * axis_x + offset_y * axis_y
+            axis_motion = motion_x * axis_x + motion_y * axis_y
+            time_near = (offset - reach) / axis_motion
+            time_far = (offset + reach) / axis_motion
+            # No motion along this axis: in contact throughout, or
+            # never
+            still = axis_motion == 0
+            touching = numpy.abs(offset) <= reach
+            enter = numpy.where(
+                still, numpy.where(touching, 0.0, 1.0),
+                numpy.minimum(time_near, time_far))
+            leave = numpy.where(
+                still, numpy.where(touching, 1.0, 0.0),
+                numpy.maximum(time_near, time_far))
+            first_contact = numpy.maximum(first_contact, enter)
+            last_contact = numpy.minimum(last_contact, leave)
+    return first_contact <= last_contact
+
+
+def obb_overlaps_any(obb, obbs, motion=None, motions=None):
+    """
+    True if obb overlaps any OBB in the list obbs. With motion and
+    motions (one per OBB) the test is swept over the step, as in
+    obbs_overlap_swept. Large batches are tested with NumPy when it
+    is installed.
+    """
+    swept = motion is not None
+    if numpy is not None and len(obbs) >= OBB_VECTORIZE_MIN_CANDIDATES:
+        obbs_array = numpy.array(obbs, dtype=numpy.float64)
+        if swept:
+            overlaps = _obbs_overlap_swept_numpy(
+                obb, motion, obbs_array,
+                numpy.array(motions, dtype=numpy.float64))
+        else:
+            overlaps = _obbs_overlap_numpy(obb, obbs_array)
+        return bool(overlaps.any())
+    for index, other in enumerate(obbs):
+        if swept:
+            if obbs_overlap_swept(obb, motion, other, motions[index]):
+                return True
+        elif obbs_overlap(obb, other):
+            return True
+    return False
@@ -0,0 +1,41 @@
+import pygame
+
+from CarGame_SurfaceCache_v10 import SurfaceCache
+
+TEXT_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+
+class FontRegistry:
+    """
+    Fonts shared by every screen, created once per (name, size),
+    plus an LRU of rendered text so unchanged lines are rasterized
+    only once. Returned text surfaces are shared: draw them, don't
+    modify them.
+    """
+
+    def __init__(self, text_cache_max_bytes=TEXT_CACHE_MAX_BYTES):
+        self.fonts = {}  # (name, size) -> pygame.font.Font
+        self.text_surfaces = SurfaceCache(text_cache_max_bytes)
+
+    def get_font(self, name, size):
+        # name as for pygame.font.Font; None is the default font
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, antialias, colour):
+        # Same as font.render(text, antialias, colour), cached
+        key = (font, text, antialias, tuple(pygame.Color(colour)))
+        text_surface = self.text_surfaces.get(key)
+        if text_surface is None:
+            text_surface = font.render(text, antialias, colour)
+            self.text_surfaces.put(key, text_surface)
+        return text_surface
+
+    def get_stats(self):
+        stats = self.text_surfaces.get_stats()
+        stats['fonts'] = len(self.fonts)
+        return stats
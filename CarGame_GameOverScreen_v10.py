@@ -1,5 +1,8 @@
 import pygame
 
+from CarGame_FontRegistry_v10 import FontRegistry
+from CarGame_StaticLayer_v10 import StaticLayer
+
 COLOR_BLACK = pygame.Color("black")
 COLOR_WHITE = pygame.Color("white")
 COLOR_YELLOW = pygame.Color("gold")  # Brighter yellow for high score
@@ -8,18 +11,24 @@ COLOR_NEW_HIGH_SCORE_CELEBRATION = pygame.Color("springgreen")
 COLOR_PROGRESS_BAR_BG = pygame.Color("gray20")
 COLOR_PROGRESS_BAR_FG = pygame.Color("darkorange")
 RESTART_HOLD_TARGET_TIME = 1.0
+PROGRESS_BAR_WIDTH = 300
+PROGRESS_BAR_HEIGHT = 25
 
 
 class GameOverScreen:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, font_registry=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.large_font = pygame.font.Font(None, 90)
-        self.medium_font = pygame.font.Font(None, 48)
-        self.score_font = pygame.font.Font(None, 42)
+        if font_registry is None:
+            font_registry = FontRegistry()
+        # Shared fonts and rendered-text cache
+        self.font_registry = font_registry
+        self.large_font = font_registry.get_font(None, 90)
+        self.medium_font = font_registry.get_font(None, 48)
+        self.score_font = font_registry.get_font(None, 42)
         # Larger for new high score text
-        self.celebration_font = pygame.font.Font(None, 52)
-        self.small_font = pygame.font.Font(None, 32)
+        self.celebration_font = font_registry.get_font(None, 52)
+        self.small_font = font_registry.get_font(None, 32)
 
         self.main_message_text = "GAME OVER"
         self.reason_message_text = "You lost!"
@@ -35,9 +44,13 @@ class GameOverScreen:
         self.space_held_duration = 0.0
         self.restart_game_triggered = False
 
+        # Pre-drawn static part of the screen, rebuilt when flagged
+        self.static_layer = StaticLayer(screen_width, screen_height,
+                                        COLOR_BLACK)
+
     def _draw_text_line(self, surface, text, font, color,
                         center_x_pos, y_pos):
-        text_surface = font.render(text, True, color)
+        text_surface = self.font_registry.render(font, text, True, color)
         text_rect = text_surface.get_rect(centerx=center_x_pos,
                                           top=y_pos)
         surface.blit(text_surface, text_rect)
@@ -46,9 +59,11 @@ class GameOverScreen:
         self.current_score = current_score
         self.high_score = high_score
         self.is_new_high_score = is_new_high
+        self.static_layer.dirty = True
 
     def set_messages(self, main_msg=None, reason_msg=None,
                      prompt_msg=None):
+        self.static_layer.dirty = True
         if main_msg is not None:
             self.main_message_text = main_msg
         if reason_msg is not None:
@@ -64,6 +79,7 @@ class GameOverScreen:
     def reset(self):
         self.space_held_duration = 0.0
         self.restart_game_triggered = False
+        self.static_layer.needs_full_redraw = True
         # self.is_new_high_score = False
         # This should be set fresh each time set_scores is called
 
@@ -80,19 +96,19 @@ class GameOverScreen:
     def should_restart_game(self):
         return self.restart_game_triggered
 
-    def draw(self, surface):
-        surface.fill(COLOR_BLACK)
+    def _compose_static_layer(self, layer):
+        # Messages and scores, drawn once per change
         center_x = self.screen_width // 2
         current_y = self.screen_height * 0.10  # Start a bit higher
 
         self._draw_text_line(
-            surface, self.main_message_text,
+            layer, self.main_message_text,
             self.large_font, COLOR_WHITE, center_x, current_y
         )
         current_y += self.large_font.get_height() + 15
 
         self._draw_text_line(
-            surface, self.reason_message_text,
+            layer, self.reason_message_text,
             self.medium_font, COLOR_WHITE, center_x, current_y
         )
         current_y += self.medium_font.get_height() + 30
@@ -100,59 +116,48 @@ class GameOverScreen:
         # --- Enhanced Score Display ---
         if self.is_new_high_score:
             self._draw_text_line(
-                surface, "🎉 NEW HIGH SCORE! 🎉",
+                layer, "🎉 NEW HIGH SCORE! 🎉",
                 self.celebration_font,
                 COLOR_NEW_HIGH_SCORE_CELEBRATION,
                 center_x, current_y
             )
             current_y += self.celebration_font.get_height() + 15
             self._draw_text_line(
-                surface, f"You scored: {self.current_score}",
+                layer, f"You scored: {self.current_score}",
                 self.score_font, COLOR_YELLOW, center_x, current_y
             )
         else:
             self._draw_text_line(
-                surface, f"Your Score: {self.current_score}",
+                layer, f"Your Score: {self.current_score}",
                 self.score_font, COLOR_WHITE, center_x, current_y
             )
         current_y += self.score_font.get_height() + 10
 
         self._draw_text_line(
-            surface, f"Current High Score: {self.high_score}",
+            layer, f"Current High Score: {self.high_score}",
             self.score_font, COLOR_WHITE, center_x, current_y
         )
         current_y += self.score_font.get_height() + 40
 
-        progress_bar_width = 300
-        progress_bar_height = 25
-        prompt_text_y = current_y
-        progress_bar_y = (
-            prompt_text_y + self.small_font.get_height() + 10
-        )
-        progress_bar_x = (
-            self.screen_width - progress_bar_width
-        ) // 2
-
-        rect_pb_bg = (
-            progress_bar_x, progress_bar_y,
-            progress_bar_width, progress_bar_height
+        self.prompt_text_y = current_y
+        self.progress_bar_y = (
+            self.prompt_text_y + self.small_font.get_height() + 10
         )
-        pygame.draw.rect(
-            surface, COLOR_PROGRESS_BAR_BG, rect_pb_bg
+        # Band holding the prompt and the bar, redrawn when they
+        # change (a pixel taller: the y positions can be fractional)
+        band_top = int(self.prompt_text_y)
+        band_bottom = int(self.progress_bar_y) + PROGRESS_BAR_HEIGHT + 1
+        return pygame.Rect(
+            0, band_top, self.screen_width, band_bottom - band_top
         )
 
+    def _get_dynamic_state(self):
+        # (bar fill width, prompt): all the dynamic part depends on
         progress_ratio = (
             self.space_held_duration / RESTART_HOLD_TARGET_TIME
         )
         current_progress_fill = (
-            min(progress_ratio, 1.0) * progress_bar_width
-        )
-        rect_pb_fg = (
-            progress_bar_x, progress_bar_y,
-            current_progress_fill, progress_bar_height
-        )
-        pygame.draw.rect(
-            surface, COLOR_PROGRESS_BAR_FG, rect_pb_fg
+            min(progress_ratio, 1.0) * PROGRESS_BAR_WIDTH
         )
 
         hold_text_display = self.prompt_message_text
@@ -164,7 +169,36 @@ class GameOverScreen:
             hold_text_display = (
                 f"Hold SPACE ({held_s} / {target_s})"
             )
+        return current_progress_fill, hold_text_display
+
+    def _draw_dynamic(self, surface, dynamic_state):
+        current_progress_fill, hold_text_display = dynamic_state
+        progress_bar_x = (
+            self.screen_width - PROGRESS_BAR_WIDTH
+        ) // 2
+        rect_pb_bg = (
+            progress_bar_x, self.progress_bar_y,
+            PROGRESS_BAR_WIDTH, PROGRESS_BAR_HEIGHT
+        )
+        pygame.draw.rect(
+            surface, COLOR_PROGRESS_BAR_BG, rect_pb_bg
+        )
+        rect_pb_fg = (
+            progress_bar_x, self.progress_bar_y,
+            current_progress_fill, PROGRESS_BAR_HEIGHT
+        )
+        pygame.draw.rect(
+            surface, COLOR_PROGRESS_BAR_FG, rect_pb_fg
+        )
         self._draw_text_line(
             surface, hold_text_display,
-            self.small_font, COLOR_WHITE, center_x, prompt_text_y
+            self.small_font, COLOR_WHITE, self.screen_width // 2,
+            self.prompt_text_y
+        )
+
+    def draw(self, surface):
+        # Rects of surface that changed, for pygame.display.update()
+        return self.static_layer.draw(
+            surface, self._compose_static_layer,
+            self._get_dynamic_state(), self._draw_dynamic
         )
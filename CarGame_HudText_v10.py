@@ -0,0 +1,109 @@
+import string
+
+import pygame
+
+# Characters rendered into the atlas up front; others are added the
+# first time they're used
+HUD_GLYPHS = string.digits + string.ascii_letters + " :.,-+/%()"
+# Strings composed from the atlas and compared with font.render()
+# once per font; if any differ, every string is rendered by the font
+HUD_CHECK_TEXTS = ("Score: 0", "Score: 11", "Score: 1234567",
+                   "Score: 9876543210", "FPS: 59.9")
+
+
+class HudText:
+    """
+    Draws short, often-changing HUD strings (score, speed, distance,
+    FPS) from a glyph atlas rendered once per font and colour. Each
+    named field keeps its composed surface and re-composes it only
+    when its text changes. Fonts the atlas can't reproduce exactly
+    (see HUD_CHECK_TEXTS) are left to font.render().
+    """
+
+    def __init__(self, font, colour, glyphs=HUD_GLYPHS):
+        self.font = font
+        self.colour = colour
+        self.atlas = None
+        self.glyph_rects = {}  # character -> Rect on the atlas
+        self.fields = {}  # field name -> (text, composed surface)
+        self.compositions = 0
+        self._build_atlas(glyphs)
+        self.matches_font = all(
+            _same_pixels(self._compose(text),
+                         self.font.render(text, True, self.colour))
+            for text in HUD_CHECK_TEXTS
+        )
+
+    def _build_atlas(self, glyphs):
+        # One row of glyphs; rebuilt with the extra characters when
+        # a new one turns up
+        glyph_surfaces = [
+            (character, self.font.render(character, True, self.colour))
+            for character in dict.fromkeys(glyphs)
+        ]
+        atlas_width = sum(glyph.get_width() for _, glyph in glyph_surfaces)
+        self.atlas = pygame.Surface(
+            (max(atlas_width, 1), self.font.get_height()), pygame.SRCALPHA
+        )
+        self.glyph_rects = {}
+        atlas_x = 0
+        for character, glyph in glyph_surfaces:
+            # MAX onto the cleared atlas copies colour and alpha as
+            # they are; a normal alpha blit would darken the edges
+            self.atlas.blit(glyph, (atlas_x, 0),
+                            special_flags=pygame.BLEND_RGBA_MAX)
+            self.glyph_rects[character] = pygame.Rect(
+                atlas_x, 0, glyph.get_width(), glyph.get_height()
+            )
+            atlas_x += glyph.get_width()
+
+    def _compose(self, text):
+        missing = [character for character in text
+                   if character not in self.glyph_rects]
+        if missing:
+            self._build_atlas(''.join(self.glyph_rects) +
+                              ''.join(missing))
+        # Each glyph goes where the font itself puts it, kerning
+        # and all: its right edge is where the text up to and
+        # including it ends. Measuring is cheap next to rasterizing.
+        width = self.font.size(text)[0]
+        composed = pygame.Surface(
+            (max(width, 1), self.font.get_height()), pygame.SRCALPHA
+        )
+        blits = []
+        for index, character in enumerate(text):
+            glyph_rect = self.glyph_rects[character]
+            dest_x = self.font.size(text[:index + 1])[0] - glyph_rect.width
+            blits.append((self.atlas, (dest_x, 0), glyph_rect,
+                          pygame.BLEND_RGBA_MAX))
+        composed.blits(blits, doreturn=False)
+        return composed
+
+    def render(self, field, text):
+        # Surface showing text for the named HUD field
+        cached = self.fields.get(field)
+        if cached is not None and cached[0] == text:
+            return cached[1]
+        if self.matches_font:
+            composed = self._compose(text)
+        else:
+            composed = self.font.render(text, True, self.colour)
+        self.compositions += 1
+        self.fields[field] = (text, composed)
+        return composed
+
+    def draw(self, surface, field, text, dest):
+        surface.blit(self.render(field, text), dest)
+
+
+def _same_pixels(surface, other):
+    # Whether both look the same drawn over black, however their
+    # fully transparent pixels happen to be stored
+    if surface.get_size() != other.get_size():
+        return False
+    flattened = []
+    for source in (surface, other):
+        flat = pygame.Surface(source.get_size())
+        flat.blit(source, (0, 0))
+        flattened.append(pygame.image.tobytes(flat, 'RGB'))
+    return flattened[0] == flattened[1]
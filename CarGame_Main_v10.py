@@ -1,17 +1,35 @@
 import pygame
 import math
 import os  # For high score file path
+from functools import partial
 
-from CarGame_Background_v10 import Background
+from CarGame_Background_v10 import (
+    Background, BACKGROUND_MODE_CHUNKED
+)
 from CarGame_PlayerCar_v10 import (
-    Car as PlayerCar, CAR_SCALE_FACTOR,
+    Car as PlayerCar, CAR_SCALE_FACTOR, CAR_IMAGE_PATH,
     CAR_MAX_SPEED_FORWARD as PLAYER_CAR_MAX_SPEED_WORLD
 )
+from CarGame_BotCar_v10 import BOT_CAR_IMAGE_PATHS, get_bot_scale_factors
+from CarGame_AssetManager_v10 import AssetManager
+from CarGame_AssetCache_v10 import AssetCache, ASSET_CACHE_DIR
+from CarGame_AssetLoader_v10 import AssetLoader
+from CarGame_RotationCache_v10 import RotationCache
+from CarGame_SpriteAtlas_v10 import SpriteAtlas
 from CarGame_TitleScreen_v10 import TitleScreen
 from CarGame_GameOverScreen_v10 import GameOverScreen
+from CarGame_FontRegistry_v10 import FontRegistry
+from CarGame_HudText_v10 import HudText
 # For stationary obstacles
 from CarGame_ObstacleManager_v10 import ObstacleManager
 from CarGame_BotManager_v10 import BotManager  # For bot cars
+from CarGame_RenderList_v10 import RenderList
+from CarGame_Presenter_v10 import Presenter, PRESENT_SCALE_INTEGER
+from CarGame_Collision_v10 import COLLISION_MODE_MASKS
+from CarGame_ViewZoom_v10 import ViewZoom, VIEW_ZOOM_LEVELS
+from CarGame_TerrainGenerators_v10 import (
+    make_terrain_generator, GrassGenerator
+)
 
 # --- Game States ---
 STATE_TITLE = "TITLE"
@@ -22,6 +40,56 @@ STATE_GAME_OVER = "GAME_OVER"
 CAMERA_SPEED_ASYMPTOTE_FACTOR = 0.95
 CAMERA_SPEED_APPROACH_RATE = 0.05  # Tune for camera speed ramp-up
 
+# --- Rendering ---
+# The game renders at INTERNAL_RENDER_SIZE whatever the window size,
+# and is scaled to the window in a single presentation pass.
+INTERNAL_RENDER_SIZE = (1280, 720)
+WINDOW_SIZE = (1280, 720)
+FULLSCREEN = False
+PRESENT_SCALE_QUALITY = PRESENT_SCALE_INTEGER
+BACKGROUND_RENDER_MODE = BACKGROUND_MODE_CHUNKED
+# Generate background chunks on a worker thread ahead of the camera
+BACKGROUND_PREFETCH_CHUNKS = True
+BACKGROUND_PREFETCH_LOOKAHEAD_SECONDS = 1.5
+# 8-bit palette indices; recolour with Background.set_palette()
+BACKGROUND_INDEXED_COLOUR = True
+# Car sprites are rotated in steps of this many degrees and cached
+CAR_ROTATION_STEP_DEGREES = 3.0
+CAR_ROTATION_CACHE_MAX_BYTES = 48 * 1024 * 1024
+# Pack rotated car frames into a few shared atlas pages
+USE_SPRITE_ATLAS = True
+# Keep decoded, pre-scaled car images in ASSET_CACHE_DIR so later
+# launches skip PNG decoding (filled on first run, or ahead of time
+# with `python CarGame_AssetCache_v10.py`)
+USE_ASSET_CACHE = True
+# Render every player car angle at load time
+PREWARM_PLAYER_ROTATIONS = True
+# Same for every bot sprite and scale; costs more memory and startup
+PREWARM_BOT_ROTATIONS = False
+# "grass", "desert", "snow", "grass_road" or "mixed"
+TERRAIN_GENERATOR_NAME = "grass"
+# Draw stationary obstacles into the cached background chunks once
+BAKE_OBSTACLES_INTO_BACKGROUND = True
+# Zoom the view out as the camera speeds up, down to the smallest of
+# VIEW_ZOOM_LEVELS at full speed. Drawing only; needs the chunked
+# background.
+VIEW_ZOOM_WITH_SPEED = True
+
+# Exact per-pixel collisions; COLLISION_MODE_OBB for cheaper
+# rotated boxes, COLLISION_MODE_RECTS for the old shrunk bounding
+# rects
+COLLISION_MODE = COLLISION_MODE_MASKS
+# Also test the path each car covered during the step, so fast cars
+# or long steps can't skip through each other or an obstacle
+SWEPT_COLLISIONS = True
+# Longest simulation step; slower frames are simulated as if this
+# much time passed. Raise it on weak hardware when SWEPT_COLLISIONS
+# is on.
+MAX_SIMULATION_STEP_SECONDS = 1.0 / 20.0
+# Move all bots in a few NumPy array operations per frame, rather
+# than one Python update per bot (ignored without NumPy)
+VECTORIZED_BOT_UPDATES = True
+
 HIGH_SCORE_FILE = "highscore.txt"
 
 
@@ -46,6 +114,27 @@ def save_high_score(score):
         )
 
 
+def predict_camera_world_y(camera_world_y, elapsed_time,
+                           lookahead_time, max_camera_speed_pixels_sec,
+                           world_unit_scale):
+    # Camera speed follows v(t) = v_max * (1 - exp(-k * t)), so the
+    # distance covered over [t, t + lookahead] has a closed form.
+    k = CAMERA_SPEED_APPROACH_RATE
+    decay_now = math.exp(-k * elapsed_time)
+    decay_later = math.exp(-k * (elapsed_time + lookahead_time))
+    travel_pixels = max_camera_speed_pixels_sec * (
+        lookahead_time - (decay_now - decay_later) / k
+    )
+    # The camera scrolls towards negative world y
+    return camera_world_y - travel_pixels / world_unit_scale
+
+
+def prewarm_rotations(asset_manager, image_path, scale, zoom=1.0):
+    image = asset_manager.get_scaled_image(image_path, scale)
+    if image is not None:
+        asset_manager.rotation_cache.prewarm(image, zoom)
+
+
 def run_game():
     pygame.init()
     pygame.font.init()
@@ -56,16 +145,52 @@ def run_game():
     except pygame.error as e:
         print(f"Warning: Error loading game icon: {e}")
 
-    screen_width = 1280
-    screen_height = 720
-    screen = pygame.display.set_mode((screen_width, screen_height))
+    screen_width, screen_height = INTERNAL_RENDER_SIZE
+    presenter = Presenter(
+        INTERNAL_RENDER_SIZE, WINDOW_SIZE,
+        PRESENT_SCALE_QUALITY, FULLSCREEN
+    )
+    # Everything draws into the internal render target
+    screen = presenter.render_target
+
+    # Decode every car image once instead of per spawn. Loading runs
+    # in the background while the title screen is up.
+    sprite_atlas = SpriteAtlas() if USE_SPRITE_ATLAS else None
+    asset_cache = AssetCache(ASSET_CACHE_DIR) if USE_ASSET_CACHE else None
+    asset_manager = AssetManager(RotationCache(
+        CAR_ROTATION_STEP_DEGREES, CAR_ROTATION_CACHE_MAX_BYTES,
+        sprite_atlas
+    ), asset_cache)
+    asset_loader = AssetLoader(
+        asset_manager, [CAR_IMAGE_PATH] + BOT_CAR_IMAGE_PATHS
+    )
+    use_view_zoom = (VIEW_ZOOM_WITH_SPEED and
+                     BACKGROUND_RENDER_MODE == BACKGROUND_MODE_CHUNKED)
+    if PREWARM_PLAYER_ROTATIONS:
+        # Every zoom level has its own pre-scaled frames
+        for zoom in (VIEW_ZOOM_LEVELS if use_view_zoom else (1.0,)):
+            asset_loader.add_task(partial(
+                prewarm_rotations, asset_manager,
+                CAR_IMAGE_PATH, CAR_SCALE_FACTOR, zoom
+            ))
+    if PREWARM_BOT_ROTATIONS:
+        for bot_image_path in BOT_CAR_IMAGE_PATHS:
+            for bot_scale in get_bot_scale_factors(CAR_SCALE_FACTOR):
+                asset_loader.add_task(partial(
+                    prewarm_rotations, asset_manager,
+                    bot_image_path, bot_scale
+                ))
     pygame.display.set_caption("Car Game")
     clock = pygame.time.Clock()
     fps = 60
 
+    # Fonts and rendered text shared by every screen
+    font_registry = FontRegistry()
     # Score and UI Font
-    score_ui_font = pygame.font.Font(None, 36)
+    score_ui_font = font_registry.get_font(None, 36)
     COLOR_SCORE_TEXT = pygame.Color("white")
+    # Glyph atlas for in-game HUD values
+    hud_text = HudText(score_ui_font, COLOR_SCORE_TEXT)
 
     world_unit_scale = 100.0
 
@@ -85,25 +210,57 @@ def run_game():
         pygame.Color("#4A7733"), pygame.Color("#649841")
     ]
 
+    # Created once so its timing stats build up over several runs
+    terrain_generator = make_terrain_generator(
+        TERRAIN_GENERATOR_NAME, grass_colours_const,
+        math.ceil(screen_width / grass_pixel_size_const)
+    )
+
     high_score = load_high_score()
 
     current_game_state = STATE_TITLE
-    title_screen_handler = TitleScreen(screen_width, screen_height)
+    title_screen_handler = TitleScreen(
+        screen_width, screen_height, font_registry
+    )
     # Set initial high score for title
     title_screen_handler.set_high_score(high_score)
-
-    game_over_screen_handler = GameOverScreen(
-        screen_width, screen_height
-    )
+    title_screen_handler.set_load_progress(asset_loader.get_progress())
+
+    # Created on the first game over, to keep it off the startup path
+    game_over_screen_handler = None
+    # None draws the gameplay view unzoomed
+    view_zoom = None
+    if use_view_zoom:
+        view_zoom = ViewZoom(screen_width, screen_height)
+    min_view_zoom = min(VIEW_ZOOM_LEVELS)
+    # Obstacles and bots spawn above the top of the widest view
+    view_top_pixels = 0
+    if view_zoom is not None:
+        view_top_pixels = view_zoom.get_base_bounds(min_view_zoom)[1]
     stationary_obstacle_manager = ObstacleManager(
-        screen_width, screen_height, world_unit_scale
+        screen_width, screen_height, world_unit_scale, COLLISION_MODE,
+        SWEPT_COLLISIONS, view_top_pixels
     )
     bot_car_manager = BotManager(
         screen_width, screen_height,
         world_unit_scale,
         PLAYER_CAR_MAX_SPEED_WORLD,
-        CAR_SCALE_FACTOR
+        CAR_SCALE_FACTOR,
+        asset_manager,
+        COLLISION_MODE,
+        SWEPT_COLLISIONS,
+        VECTORIZED_BOT_UPDATES,
+        view_top_pixels
     )
+    # Reused every frame for the obstacle and bot draw calls
+    render_list = RenderList()
+    # Background chunks reach as far sideways as the widest view
+    background_margin_cols = 0
+    if view_zoom is not None:
+        background_margin_cols = math.ceil(
+            -view_zoom.get_base_bounds(min_view_zoom)[0] /
+            grass_pixel_size_const
+        )
 
     # Gameplay variables
     player_car = None
@@ -119,17 +276,24 @@ def run_game():
     is_running = True
     while is_running:
         delta_time = clock.tick(fps) / 1000.0
-        if delta_time > (1.0 / 20.0):
-            delta_time = (1.0 / 20.0)
+        if delta_time > MAX_SIMULATION_STEP_SECONDS:
+            delta_time = MAX_SIMULATION_STEP_SECONDS
 
         keys_pressed = pygame.key.get_pressed()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 is_running = False
 
+        # Areas of the screen changed this frame; None for all of it
+        dirty_rects = None
         if current_game_state == STATE_TITLE:
+            if not asset_loader.is_done():
+                asset_loader.update()
+                title_screen_handler.set_load_progress(
+                    asset_loader.get_progress()
+                )
             title_screen_handler.update(delta_time, keys_pressed)
-            title_screen_handler.draw(screen)
+            dirty_rects = title_screen_handler.draw(screen)
             if title_screen_handler.should_start_game():
                 current_game_state = STATE_PLAYING
                 # Reset gameplay variables for a new game
@@ -138,10 +302,25 @@ def run_game():
                 car_off_screen_timer = 0.0
                 current_score = 0  # Reset score
 
+                if game_background is not None:
+                    game_background.close()
+                if not terrain_generator.is_fast_enough():
+                    print(
+                        f"Warning: Terrain generator "
+                        f"'{TERRAIN_GENERATOR_NAME}' is over its "
+                        f"chunk budget, using plain grass."
+                    )
+                    terrain_generator = GrassGenerator(
+                        grass_colours_const)
                 game_background = Background(
                     screen_width, screen_height,
                     grass_pixel_size_const,
-                    grass_colours_const
+                    grass_colours_const,
+                    render_mode=BACKGROUND_RENDER_MODE,
+                    prefetch_chunks=BACKGROUND_PREFETCH_CHUNKS,
+                    indexed_colour=BACKGROUND_INDEXED_COLOUR,
+                    terrain_generator=terrain_generator,
+                    chunk_margin_cols=background_margin_cols
                 )
                 car_initial_world_x = (
                     (screen_width / 2.0) / world_unit_scale
@@ -154,11 +333,18 @@ def run_game():
                     car_y_world_offset + game_camera_world_y
                 )
                 player_car = PlayerCar(
-                    car_initial_world_x, car_initial_world_y
+                    car_initial_world_x, car_initial_world_y,
+                    asset_manager
                 )
 
                 stationary_obstacle_manager.reset()
+                if BAKE_OBSTACLES_INTO_BACKGROUND:
+                    stationary_obstacle_manager.set_bake_target(
+                        game_background
+                    )
                 bot_car_manager.reset()  # Reset bot cars
+                if view_zoom is not None:
+                    view_zoom.set_zoom(1.0)
                 title_screen_handler.reset()
 
         elif current_game_state == STATE_PLAYING:
@@ -186,6 +372,22 @@ def run_game():
                 camera_y_pixel_change_on_screen / world_unit_scale
             )
             total_elapsed_time_playing += delta_time
+            if view_zoom is not None:
+                # Camera speed only ever rises, so the zoom steps
+                # out level by level without flickering between two
+                view_zoom.set_zoom(
+                    1.0 - (1.0 - min_view_zoom) * decay_factor
+                )
+
+            game_background.prefetch(
+                game_camera_world_y,
+                predict_camera_world_y(
+                    game_camera_world_y, total_elapsed_time_playing,
+                    BACKGROUND_PREFETCH_LOOKAHEAD_SECONDS,
+                    max_camera_speed_pixels_sec, world_unit_scale
+                ),
+                world_unit_scale
+            )
 
             stationary_obstacle_manager.update_spawning_and_culling(
                 game_camera_world_y
@@ -196,8 +398,13 @@ def run_game():
             current_score += score_from_bots
 
             game_over_reason = None
+            # Off course means out of sight, which reaches further
+            # when the view is zoomed out
+            visible_rect = screen_bounds_rect
+            if view_zoom is not None and view_zoom.is_zoomed():
+                visible_rect = view_zoom.get_base_rect()
             if not player_car.collision_rect.colliderect(
-                    screen_bounds_rect):
+                    visible_rect):
                 car_off_screen_timer += delta_time
                 if car_off_screen_timer >= CAR_OFF_SCREEN_LIMIT_SECONDS:
                     game_over_reason = "You strayed too far off course!"
@@ -228,6 +435,10 @@ def run_game():
                     high_score = current_score
                     save_high_score(high_score)
                     is_new_high = True
+                if game_over_screen_handler is None:
+                    game_over_screen_handler = GameOverScreen(
+                        screen_width, screen_height, font_registry
+                    )
                 game_over_screen_handler.set_scores(
                     current_score, high_score, is_new_high
                 )
@@ -240,26 +451,32 @@ def run_game():
             # --- Drawing ---
             screen.fill(pygame.Color("black"))
             game_background.draw(
-                screen, game_camera_world_y, world_unit_scale
+                screen, game_camera_world_y, world_unit_scale,
+                view_zoom
+            )
+            # Obstacles, then bot cars, batched into one render list
+            stationary_obstacle_manager.submit_draw_calls(
+                render_list, game_camera_world_y, world_unit_scale,
+                screen_height, view_zoom
             )
-            stationary_obstacle_manager.draw_all(
-                screen, game_camera_world_y, world_unit_scale
+            bot_car_manager.submit_draw_calls(
+                render_list, game_camera_world_y, screen_height,
+                view_zoom
             )
-            # Draw bot cars
-            bot_car_manager.draw_all(screen, game_camera_world_y)
+            render_list.flush(screen)
             player_car.draw(
-                screen, game_camera_world_y, world_unit_scale
+                screen, game_camera_world_y, world_unit_scale,
+                view_zoom
             )
 
             # Draw Score UI
-            score_text_surface = score_ui_font.render(
-                f"Score: {current_score}", True, COLOR_SCORE_TEXT
+            hud_text.draw(
+                screen, 'score', f"Score: {current_score}", (10, 10)
             )
-            screen.blit(score_text_surface, (10, 10))
 
         elif current_game_state == STATE_GAME_OVER:
             game_over_screen_handler.update(delta_time, keys_pressed)
-            game_over_screen_handler.draw(screen)
+            dirty_rects = game_over_screen_handler.draw(screen)
             if game_over_screen_handler.should_restart_game():
                 current_game_state = STATE_TITLE
                 # Update title screen with latest high score
@@ -267,8 +484,11 @@ def run_game():
                 title_screen_handler.reset()
                 game_over_screen_handler.reset()
 
-        pygame.display.flip()
+        presenter.present(dirty_rects)
 
+    if game_background is not None:
+        game_background.close()
+    asset_loader.close()
     pygame.font.quit()
     pygame.quit()
 
@@ -1,6 +1,16 @@
+import math
 import pygame
 import random
 from CarGame_Obstacle_v10 import Obstacle
+from CarGame_RenderList_v10 import RenderList
+from CarGame_Collision_v10 import (
+    COLLISION_MODE_RECTS, COLLISION_MODE_MASKS, COLLISION_MODE_OBB,
+    mask_overlaps_rect, obb_overlaps_any, obbs_overlap_swept,
+    obbs_passed_through, rect_to_obb
+)
+
+# Obstacles never move
+STATIONARY_MOTION = (0.0, 0.0)
 
 OBSTACLE_COLOR = pygame.Color("gray50")
 MIN_OBSTACLE_WIDTH_WORLD = 0.5
@@ -15,19 +25,36 @@ TARGET_OBSTACLES_PER_Y_WORLD_DISTANCE = 10.0
 
 class ObstacleManager:
     def __init__(self, screen_width_pixels, screen_height_pixels,
-                 world_unit_scale):
+                 world_unit_scale, collision_mode=COLLISION_MODE_RECTS,
+                 swept_collisions=False, view_top_pixels=0):
         self.obstacles = []
         self.screen_width_pixels = screen_width_pixels
         self.screen_height_pixels = screen_height_pixels
         self.world_unit_scale = world_unit_scale
+        self.collision_mode = collision_mode
+        # Test the car's whole motion over each step, not just where
+        # it ends up
+        self.swept_collisions = swept_collisions
         self.screen_width_world = (
             screen_width_pixels / world_unit_scale
         )
         self.screen_height_world = (
             screen_height_pixels / world_unit_scale
         )
+        # New obstacles start out of sight even at the top of the
+        # widest (zoomed-out) view, whose top row is view_top_pixels
+        # (negative when zoomed out)
+        self.spawn_distance_ahead_world = max(
+            self.screen_height_world * SPAWN_DISTANCE_AHEAD_FACTOR,
+            -view_top_pixels / world_unit_scale + MAX_OBSTACLE_HEIGHT_WORLD
+        )
         self.last_camera_y_for_spawn_check = 0.0
         self.accumulated_camera_dy_world = 0.0
+        # Background that new obstacles get baked into, if any
+        self.bake_target = None
+
+    def set_bake_target(self, background):
+        self.bake_target = background
 
     def reset(self):
         self.obstacles = []
@@ -52,6 +79,10 @@ class ObstacleManager:
             world_x, target_world_y, width_world,
             height_world, OBSTACLE_COLOR
         )
+        if self.bake_target is not None:
+            new_obstacle.is_baked = self.bake_target.bake_obstacle(
+                new_obstacle, self.world_unit_scale
+            )
         self.obstacles.append(new_obstacle)
 
     def update_spawning_and_culling(self, camera_world_y):
@@ -77,10 +108,7 @@ class ObstacleManager:
                 self.accumulated_camera_dy_world / target_dist
             )
             for _ in range(num_to_spawn_events):
-                spawn_offset_base = (
-                    self.screen_height_world *
-                    SPAWN_DISTANCE_AHEAD_FACTOR
-                )
+                spawn_offset_base = self.spawn_distance_ahead_world
                 random_depth_offset = random.uniform(
                     0, self.screen_height_world *
                     SPAWN_ZONE_DEPTH_FACTOR
@@ -111,15 +139,84 @@ class ObstacleManager:
                          world_unit_scale):
         if not player_car:
             return False
+        player_motion = None
+        if self.swept_collisions:
+            player_motion = player_car.get_screen_motion(
+                world_unit_scale)
+
+        if self.collision_mode == COLLISION_MODE_OBB:
+            player_obb = player_car.get_obb(camera_world_y,
+                                            world_unit_scale)
+            player_reach = math.hypot(player_obb[2], player_obb[3])
+            if self.swept_collisions:
+                player_reach += abs(player_motion[1])
+            candidate_obbs = []
+            for obs in self.obstacles:
+                obs_obb = obs.get_obb(camera_world_y, world_unit_scale)
+                if (abs(obs_obb[1] - player_obb[1]) >
+                        player_reach + obs_obb[3]):
+                    continue
+                candidate_obbs.append(obs_obb)
+            candidate_motions = None
+            if self.swept_collisions:
+                candidate_motions = [STATIONARY_MOTION] * len(
+                    candidate_obbs)
+            return obb_overlaps_any(player_obb, candidate_obbs,
+                                    player_motion, candidate_motions)
+
+        if self.collision_mode == COLLISION_MODE_MASKS:
+            # Obstacles are solid rectangles: only the car needs a
+            # mask, and only once its image rect touches one
+            player_mask = None
+            for obs in self.obstacles:
+                obs.update_screen_rect(camera_world_y, world_unit_scale)
+                if player_car.image_rect.colliderect(obs.rect):
+                    if player_mask is None:
+                        player_mask = player_car.get_mask()
+                    if mask_overlaps_rect(player_mask,
+                                          player_car.image_rect,
+                                          obs.rect):
+                        return True
+                # The mask only sees where the car ended up; catch it
+                # skipping right over an obstacle
+                if self.swept_collisions and obbs_passed_through(
+                        player_car.get_obb(camera_world_y,
+                                           world_unit_scale),
+                        player_motion,
+                        obs.get_obb(camera_world_y, world_unit_scale),
+                        STATIONARY_MOTION):
+                    return True
+            return False
 
         for obs in self.obstacles:
             obs.update_screen_rect(camera_world_y, world_unit_scale)
+            if self.swept_collisions:
+                if obbs_overlap_swept(
+                        rect_to_obb(player_car.collision_rect),
+                        player_motion, rect_to_obb(obs.rect),
+                        STATIONARY_MOTION):
+                    return True
+                continue
             # Use the car's specific collision_rect for the check
             # <--- MODIFIED HERE
             if player_car.collision_rect.colliderect(obs.rect):
                 return True
         return False
 
-    def draw_all(self, surface, camera_world_y, world_unit_scale):
+    def submit_draw_calls(self, render_list, camera_world_y,
+                          world_unit_scale, view_height, view_zoom=None):
         for obs in self.obstacles:
-            obs.draw(surface, camera_world_y, world_unit_scale)
+            # Baked obstacles are already part of the background;
+            # collisions still use the full obstacle list.
+            if obs.is_baked:
+                continue
+            rect = obs.get_fill_rect(camera_world_y, world_unit_scale,
+                                     view_zoom)
+            if rect[1] + rect[3] > 0 and rect[1] < view_height:
+                render_list.add_fill(obs.color, rect)
+
+    def draw_all(self, surface, camera_world_y, world_unit_scale):
+        render_list = RenderList()
+        self.submit_draw_calls(render_list, camera_world_y,
+                               world_unit_scale, surface.get_height())
+        render_list.flush(surface)
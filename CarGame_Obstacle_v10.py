@@ -13,6 +13,9 @@ class Obstacle:
         # Screen rect, updated by ObstacleManager or before drawing
         # Dimensions will be calculated from world units and scale
         self.rect = pygame.Rect(0, 0, 0, 0)
+        # Set when the obstacle has been drawn into the cached
+        # background chunks and needs no drawing of its own
+        self.is_baked = False
 
     def update_screen_rect(self, camera_world_y, world_unit_scale):
         """
@@ -30,6 +33,45 @@ class Obstacle:
         self.rect = pygame.Rect(0, 0, screen_width, screen_height)
         self.rect.center = (screen_center_x, screen_center_y)
 
+    def get_fill_rect(self, camera_world_y, world_unit_scale,
+                      view_zoom=None):
+        """
+        Screen (x, y, width, height) of the obstacle, same as
+        update_screen_rect but as a plain tuple, without touching
+        self.rect. With view_zoom, the rect as drawn in the zoomed
+        view.
+        """
+        screen_width = round(self.width_world * world_unit_scale)
+        screen_height = round(self.height_world * world_unit_scale)
+        screen_x = (round(self.world_x * world_unit_scale) -
+                    screen_width // 2)
+        screen_y = (round((self.world_y - camera_world_y) *
+                          world_unit_scale) -
+                    screen_height // 2)
+        if view_zoom is not None and view_zoom.is_zoomed():
+            # Map both corners, so neighbouring edges stay together
+            left, top = view_zoom.to_screen(screen_x, screen_y)
+            right, bottom = view_zoom.to_screen(
+                screen_x + screen_width, screen_y + screen_height)
+            screen_x = round(left)
+            screen_y = round(top)
+            screen_width = round(right) - screen_x
+            screen_height = round(bottom) - screen_y
+        return screen_x, screen_y, screen_width, screen_height
+
+    def get_obb(self, camera_world_y, world_unit_scale):
+        """
+        The obstacle as an unrotated oriented box, for SAT tests
+        against cars (see CarGame_Collision_v10).
+        """
+        return (
+            self.world_x * world_unit_scale,
+            (self.world_y - camera_world_y) * world_unit_scale,
+            self.width_world * world_unit_scale / 2,
+            self.height_world * world_unit_scale / 2,
+            0.0
+        )
+
     def draw(self, surface, camera_world_y, world_unit_scale):
         """
         Draws the obstacle on the given surface.
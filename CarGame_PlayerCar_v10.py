@@ -19,28 +19,35 @@ CAR_COLLISION_RECT_SCALE_FACTOR = 0.75
 
 
 class Car:
-    def __init__(self, world_x, world_y):
+    def __init__(self, world_x, world_y, asset_manager):
         self.world_x = float(world_x)
         self.world_y = float(world_y)
+        # Position before the last update, for swept collisions
+        self.previous_world_x = self.world_x
+        self.previous_world_y = self.world_y
 
-        try:
-            unscaled_image = pygame.image.load(
-                CAR_IMAGE_PATH
-            ).convert_alpha()
-        except pygame.error as e:
-            print(f"Error loading car image: {CAR_IMAGE_PATH}")
-            raise SystemExit(e)
-
-        width = int(unscaled_image.get_width() * CAR_SCALE_FACTOR)
-        height = int(unscaled_image.get_height() * CAR_SCALE_FACTOR)
-        self.image_original = pygame.transform.scale(
-            unscaled_image, (width, height)
+        # Shared scaled copy, loaded once by the asset manager
+        self.image_original = asset_manager.get_scaled_image(
+            CAR_IMAGE_PATH, CAR_SCALE_FACTOR
         )
+        if self.image_original is None:
+            print(f"Error loading car image: {CAR_IMAGE_PATH}")
+            raise SystemExit(asset_manager.load_errors[CAR_IMAGE_PATH])
+        self.rotation_cache = asset_manager.rotation_cache
         self.image = self.image_original
+        # Part of self.image to draw; None for the whole surface (set
+        # when the frame lives on a sprite atlas page)
+        self.image_area = None
 
         self.image_rect = self.image.get_rect()
         self.collision_rect = self.image_rect.copy()
         self._update_collision_rect_from_image_rect()
+        # Oriented collision box: the unrotated sprite shrunk like
+        # collision_rect, turning with the car
+        self.obb_half_width = (self.image_original.get_width() *
+                               CAR_COLLISION_RECT_SCALE_FACTOR / 2)
+        self.obb_half_length = (self.image_original.get_height() *
+                                CAR_COLLISION_RECT_SCALE_FACTOR / 2)
 
         self.angle = 0.0
         self.velocity = 0.0
@@ -57,6 +64,13 @@ class Car:
             return 0.0
         return new_value
 
+    def _get_image_rect(self, center):
+        if self.image_area is None:
+            return self.image.get_rect(center=center)
+        image_rect = pygame.Rect((0, 0), self.image_area.size)
+        image_rect.center = center
+        return image_rect
+
     def _update_collision_rect_from_image_rect(self):
         new_width = int(
             self.image_rect.width * CAR_COLLISION_RECT_SCALE_FACTOR
@@ -73,12 +87,37 @@ class Car:
         screen_center_y = round(
             (self.world_y - camera_world_y) * world_unit_scale
         )
-        self.image_rect = self.image.get_rect(
-            center=(screen_center_x, screen_center_y)
+        self.image_rect = self._get_image_rect(
+            (screen_center_x, screen_center_y)
         )
         self._update_collision_rect_from_image_rect()
 
+    def get_mask(self):
+        # Collision mask of the current rotated image, placed at
+        # image_rect
+        return self.rotation_cache.get_mask(
+            self.image_original, -self.angle
+        )
+
+    def get_obb(self, camera_world_y, world_unit_scale):
+        # Screen-space oriented box, see CarGame_Collision_v10
+        return (
+            self.world_x * world_unit_scale,
+            (self.world_y - camera_world_y) * world_unit_scale,
+            self.obb_half_width, self.obb_half_length,
+            math.radians(self.angle)
+        )
+
+    def get_screen_motion(self, world_unit_scale):
+        # Pixels moved by the last update, as (dx, dy)
+        return (
+            (self.world_x - self.previous_world_x) * world_unit_scale,
+            (self.world_y - self.previous_world_y) * world_unit_scale
+        )
+
     def update(self, delta_time, keys_pressed):
+        self.previous_world_x = self.world_x
+        self.previous_world_y = self.world_y
         is_braking = (keys_pressed[pygame.K_LSHIFT] or
                       keys_pressed[pygame.K_RSHIFT])
         if is_braking:
@@ -145,17 +184,36 @@ class Car:
         self.world_y -= math.cos(
             angle_rad
         ) * self.velocity * delta_time
-        self.image = pygame.transform.rotozoom(
-            self.image_original, -self.angle, 1.0
+        self.image, self.image_area = self.rotation_cache.get_frame(
+            self.image_original, -self.angle
         )
 
-    def draw(self, surface, camera_world_y, world_unit_scale):
+    def draw(self, surface, camera_world_y, world_unit_scale,
+             view_zoom=None):
+        if view_zoom is not None and view_zoom.is_zoomed():
+            # Frame pre-scaled for the zoom level; image_rect keeps
+            # the unzoomed position collisions use
+            image, area = self.rotation_cache.get_frame(
+                self.image_original, -self.angle, view_zoom.zoom
+            )
+            center_x, center_y = view_zoom.to_screen(
+                self.world_x * world_unit_scale,
+                (self.world_y - camera_world_y) * world_unit_scale
+            )
+            if area is None:
+                zoomed_rect = image.get_rect()
+            else:
+                zoomed_rect = pygame.Rect((0, 0), area.size)
+            zoomed_rect.center = (round(center_x), round(center_y))
+            surface.blit(image, zoomed_rect.topleft, area)
+            return
+
         screen_center_x = round(self.world_x * world_unit_scale)
         screen_center_y = round(
             (self.world_y - camera_world_y) * world_unit_scale
         )
-        self.image_rect = self.image.get_rect(
-            center=(screen_center_x, screen_center_y)
+        self.image_rect = self._get_image_rect(
+            (screen_center_x, screen_center_y)
         )
 
         # Optional Debug Collision Rect (ensure
@@ -164,4 +222,5 @@ class Car:
         # if hasattr(self, 'collision_rect'):
         #    pygame.draw.rect(surface, (255, 0, 0),
         #                     self.collision_rect, 1)
-        surface.blit(self.image, self.image_rect.topleft)
+        surface.blit(self.image, self.image_rect.topleft,
+                     self.image_area)
@@ -0,0 +1,124 @@
+import pygame
+
+# Presentation scaling quality
+# Nearest-neighbour by a whole-number factor, letterboxed (sharp
+# pixels); falls back to nearest-neighbour fit when the window is
+# smaller than the render target
+PRESENT_SCALE_INTEGER = "integer"
+# Bilinear filtering to the largest size that keeps the aspect ratio
+PRESENT_SCALE_SMOOTH = "smooth"
+
+COLOR_LETTERBOX = pygame.Color("black")
+
+
+class Presenter:
+    """
+    Owns the window and a fixed-size internal render target. The
+    game draws into render_target at its own resolution, and
+    present() scales it onto the window in one step.
+    """
+
+    def __init__(self, render_size, window_size,
+                 scale_quality=PRESENT_SCALE_INTEGER,
+                 fullscreen=False):
+        self.scale_quality = scale_quality
+        if fullscreen:
+            # (0, 0) picks the desktop resolution
+            self.display_surface = pygame.display.set_mode(
+                (0, 0), pygame.FULLSCREEN
+            )
+        else:
+            self.display_surface = pygame.display.set_mode(window_size)
+        window_width, window_height = self.display_surface.get_size()
+        render_width, render_height = render_size
+
+        fit_factor = min(window_width / render_width,
+                         window_height / render_height)
+        if (self.scale_quality == PRESENT_SCALE_INTEGER and
+                fit_factor >= 1):
+            fit_factor = int(fit_factor)
+        self.scale_factor = fit_factor
+        dest_width = round(render_width * fit_factor)
+        dest_height = round(render_height * fit_factor)
+        self.dest_rect = pygame.Rect(0, 0, dest_width, dest_height)
+        self.dest_rect.center = (window_width // 2, window_height // 2)
+
+        self.is_passthrough = (
+            self.dest_rect.size == (render_width, render_height)
+        )
+        if self.is_passthrough:
+            # Same size: draw straight into the window, nothing to
+            # scale at present time
+            self.render_target = self.display_surface.subsurface(
+                self.dest_rect)
+        else:
+            self.render_target = pygame.Surface(render_size).convert()
+            self.dest_surface = self.display_surface.subsurface(
+                self.dest_rect)
+
+        # Window areas outside dest_rect, cleared every present
+        self.letterbox_rects = []
+        if self.dest_rect.left > 0:
+            self.letterbox_rects.append(pygame.Rect(
+                0, 0, self.dest_rect.left, window_height))
+            self.letterbox_rects.append(pygame.Rect(
+                self.dest_rect.right, 0,
+                window_width - self.dest_rect.right, window_height))
+        if self.dest_rect.top > 0:
+            self.letterbox_rects.append(pygame.Rect(
+                0, 0, window_width, self.dest_rect.top))
+            self.letterbox_rects.append(pygame.Rect(
+                0, self.dest_rect.bottom,
+                window_width, window_height - self.dest_rect.bottom))
+
+    def present(self, dirty_rects=None):
+        """
+        Shows the render target. dirty_rects, in render target
+        coordinates, limits the update to those areas (an empty list
+        skips the update entirely); None updates everything.
+        """
+        if dirty_rects is not None and self._can_present_rects():
+            if dirty_rects:
+                pygame.display.update(
+                    [self._present_rect(rect) for rect in dirty_rects]
+                )
+            return
+        if not self.is_passthrough:
+            for letterbox_rect in self.letterbox_rects:
+                self.display_surface.fill(COLOR_LETTERBOX,
+                                          letterbox_rect)
+            if self.scale_quality == PRESENT_SCALE_SMOOTH:
+                pygame.transform.smoothscale(
+                    self.render_target, self.dest_rect.size,
+                    self.dest_surface
+                )
+            else:
+                pygame.transform.scale(
+                    self.render_target, self.dest_rect.size,
+                    self.dest_surface
+                )
+        pygame.display.flip()
+
+    def _can_present_rects(self):
+        # Partial updates need rects to map exactly onto window
+        # pixels: no scaling, or nearest-neighbour by a whole number
+        return (self.is_passthrough or
+                (self.scale_quality == PRESENT_SCALE_INTEGER and
+                 self.scale_factor == int(self.scale_factor)))
+
+    def _present_rect(self, rect):
+        # Copies one render target rect to the window; returns the
+        # window rect to update
+        factor = int(self.scale_factor)
+        rect = pygame.Rect(rect).clip(self.render_target.get_rect())
+        window_rect = pygame.Rect(
+            rect.x * factor, rect.y * factor,
+            rect.width * factor, rect.height * factor
+        )
+        if not self.is_passthrough:
+            pygame.transform.scale(
+                self.render_target.subsurface(rect), window_rect.size,
+                self.dest_surface.subsurface(window_rect)
+            )
+        window_rect.move_ip(self.dest_rect.topleft)
+        return window_rect
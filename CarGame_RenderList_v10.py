@@ -0,0 +1,58 @@
+RENDER_BLIT = "blit"
+RENDER_FILL = "fill"
+
+
+class RenderList:
+    """
+    Per-frame list of draw commands. Managers add blits and
+    rectangle fills; flush() draws them in submission order, each
+    run of consecutive blits with a single Surface.blits call.
+    """
+
+    def __init__(self):
+        # [kind, items] runs, in submission order
+        self.runs = []
+        self.num_commands = 0
+
+    def __len__(self):
+        return self.num_commands
+
+    def _items_for(self, kind):
+        if not self.runs or self.runs[-1][0] != kind:
+            self.runs.append([kind, []])
+        return self.runs[-1][1]
+
+    def add_blit(self, source, dest, area=None):
+        # dest is a (x, y) topleft; area as in Surface.blit
+        self._items_for(RENDER_BLIT).append((source, dest, area))
+        self.num_commands += 1
+
+    def add_fill(self, colour, rect):
+        # rect is (x, y, width, height). Surface.fill moves a
+        # negative x/y to 0 without shrinking the rect, so clip the
+        # top-left edge here to match pygame.draw.rect.
+        x, y, width, height = rect
+        if x < 0:
+            width += x
+            x = 0
+        if y < 0:
+            height += y
+            y = 0
+        if width <= 0 or height <= 0:
+            return
+        self._items_for(RENDER_FILL).append((colour, (x, y, width, height)))
+        self.num_commands += 1
+
+    def clear(self):
+        self.runs = []
+        self.num_commands = 0
+
+    def flush(self, surface):
+        # Draws everything onto surface and empties the list
+        for kind, items in self.runs:
+            if kind == RENDER_BLIT:
+                surface.blits(items, doreturn=False)
+            else:
+                for colour, rect in items:
+                    surface.fill(colour, rect)
+        self.clear()
@@ -0,0 +1,107 @@
+import pygame
+
+from CarGame_SurfaceCache_v10 import SurfaceCache
+
+ROTATION_ANGLE_STEP_DEGREES = 3.0
+ROTATION_CACHE_MAX_BYTES = 48 * 1024 * 1024
+# Collision masks are one bit per pixel, so this holds far more
+# frames than the sprite budget above
+ROTATION_MASK_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+
+class RotationCache:
+    """
+    Shared cache of rotozoomed sprites keyed by
+    (source surface, scale, quantized angle). Filled lazily. Every
+    car drawn from the same source surface shares its frames.
+
+    With an atlas, frames are packed into its pages and handed out
+    as (page, area); once the atlas is full, further frames are kept
+    as separate surfaces in an LRU bounded on total bytes.
+
+    Collision masks of the same frames are cached alongside, built
+    the first time a frame is collision-tested.
+    """
+
+    def __init__(self, angle_step=ROTATION_ANGLE_STEP_DEGREES,
+                 max_bytes=ROTATION_CACHE_MAX_BYTES, atlas=None,
+                 mask_max_bytes=ROTATION_MASK_CACHE_MAX_BYTES):
+        self.num_angles = max(1, round(360.0 / angle_step))
+        # Snap the step so the angles divide the circle exactly
+        self.angle_step = 360.0 / self.num_angles
+        self.frames = SurfaceCache(max_bytes)
+        self.atlas = atlas
+        self.atlas_hits = 0
+        self.masks = SurfaceCache(mask_max_bytes)
+
+    def angle_index(self, angle):
+        return round(angle / self.angle_step) % self.num_angles
+
+    def _frame_for_key(self, key):
+        if self.atlas is not None:
+            region = self.atlas.get(key)
+            if region is not None:
+                self.atlas_hits += 1
+                return region
+        rotated = self.frames.get(key)
+        if rotated is not None:
+            return rotated, None
+
+        source, scale, angle_index = key
+        rotated = pygame.transform.rotozoom(
+            source, angle_index * self.angle_step, scale
+        )
+        if self.atlas is not None:
+            region = self.atlas.add(key, rotated)
+            if region is not None:
+                return region
+        self.frames.put(key, rotated)
+        return rotated, None
+
+    def get_frame(self, source, angle, scale=1.0):
+        """
+        Returns (surface, area) for the rotated sprite: draw it with
+        blit(surface, dest, area). area is None when the frame is a
+        surface of its own rather than part of an atlas page.
+        angle follows pygame.transform.rotozoom: degrees,
+        anticlockwise.
+        """
+        return self._frame_for_key(
+            (source, scale, self.angle_index(angle)))
+
+    def get_rotated(self, source, angle, scale=1.0):
+        # Same frame as a standalone surface
+        surface, area = self.get_frame(source, angle, scale)
+        if area is None:
+            return surface
+        return surface.subsurface(area)
+
+    def get_mask(self, source, angle, scale=1.0):
+        # pygame.Mask of the frame get_frame() returns for the same
+        # arguments, same size as the frame
+        key = (source, scale, self.angle_index(angle))
+        mask = self.masks.get(key)
+        if mask is None:
+            surface, area = self._frame_for_key(key)
+            if area is not None:
+                surface = surface.subsurface(area)
+            mask = pygame.mask.from_surface(surface)
+            width, height = mask.get_size()
+            self.masks.put(key, mask, (width * height + 7) // 8)
+        return mask
+
+    def prewarm(self, source, scale=1.0):
+        # Render every angle up front, e.g. at load time. With an
+        # atlas this packs them into its pages.
+        for angle_index in range(self.num_angles):
+            key = (source, scale, angle_index)
+            if key not in self.frames:
+                self._frame_for_key(key)
+
+    def get_stats(self):
+        stats = self.frames.get_stats()
+        if self.atlas is not None:
+            stats['atlas_hits'] = self.atlas_hits
+            stats.update(self.atlas.get_stats())
+        stats['masks'] = len(self.masks)
+        return stats
@@ -0,0 +1,84 @@
+import pygame
+
+ATLAS_PAGE_SIZE = (2048, 2048)
+ATLAS_MAX_PAGES = 4
+ATLAS_PADDING = 1  # Transparent gap so neighbours never bleed
+
+
+class SpriteAtlas:
+    """
+    Packs many small sprites into a few large pages with a simple
+    shelf packer. A sprite is drawn with
+    surface.blit(page, dest, area). Regions are never freed; once
+    max_pages are full, add() returns None and callers keep their
+    own surface instead.
+    """
+
+    def __init__(self, page_size=ATLAS_PAGE_SIZE,
+                 max_pages=ATLAS_MAX_PAGES, padding=ATLAS_PADDING):
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.padding = padding
+        self.pages = []
+        self.regions = {}  # key -> (page, area Rect)
+
+        # Shelf cursor for the newest page
+        self.shelf_x = 0
+        self.shelf_y = 0
+        self.shelf_height = 0
+
+    def __contains__(self, key):
+        return key in self.regions
+
+    def get(self, key):
+        return self.regions.get(key)
+
+    def _new_page(self):
+        page = pygame.Surface(
+            self.page_size, pygame.SRCALPHA).convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self.shelf_x = 0
+        self.shelf_y = 0
+        self.shelf_height = 0
+
+    def _reserve(self, width, height):
+        # Returns (page, Rect) of free space, or None when full
+        page_width, page_height = self.page_size
+        if width > page_width or height > page_height:
+            return None
+        if not self.pages:
+            self._new_page()
+        if self.shelf_x + width > page_width:
+            # Start a new shelf under the current one
+            self.shelf_x = 0
+            self.shelf_y += self.shelf_height + self.padding
+            self.shelf_height = 0
+        if self.shelf_y + height > page_height:
+            if len(self.pages) >= self.max_pages:
+                return None
+            self._new_page()
+        area = pygame.Rect(self.shelf_x, self.shelf_y, width, height)
+        self.shelf_x += width + self.padding
+        self.shelf_height = max(self.shelf_height, height)
+        return self.pages[-1], area
+
+    def add(self, key, sprite):
+        region = self.regions.get(key)
+        if region is not None:
+            return region
+        region = self._reserve(*sprite.get_size())
+        if region is None:
+            return None
+        page, area = region
+        # Adding onto the cleared page copies the pixels and alpha
+        # exactly; a normal alpha blit would darken soft edges.
+        page.blit(sprite, area, special_flags=pygame.BLEND_RGBA_ADD)
+        self.regions[key] = region
+        return region
+
+    def get_stats(self):
+        return {
+            'pages': len(self.pages),
+            'sprites': len(self.regions),
+        }
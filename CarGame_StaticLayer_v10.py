@@ -0,0 +1,56 @@
+import pygame
+
+
+class StaticLayer:
+    """
+    Pre-drawn static part of a menu screen, and the dirty-rect
+    bookkeeping for drawing the screen over it. Only the screen's
+    dynamic band is redrawn between changes, and only when what it
+    shows changes.
+    """
+
+    def __init__(self, width, height, fill_colour):
+        self.width = width
+        self.height = height
+        self.fill_colour = fill_colour
+        self.layer = None  # Created on first use, in display format
+        # Screen area redrawn every change; set by compose
+        self.dynamic_rect = None
+        # Set when the static content changed and needs composing
+        self.dirty = True
+        # Set when the target surface was drawn over by something
+        # else, e.g. gameplay, and needs everything again
+        self.needs_full_redraw = True
+        self.last_dynamic_state = None
+
+    def draw(self, surface, compose, dynamic_state, draw_dynamic):
+        """
+        Draws the screen onto surface and returns the rects that
+        changed, for pygame.display.update(); an empty list when the
+        frame is the same as the last one.
+
+        compose(layer) draws the static part onto the filled layer
+        and returns the rect of the dynamic band.
+        draw_dynamic(surface, dynamic_state) draws that band, which
+        must depend on nothing but dynamic_state.
+        """
+        if self.dirty:
+            if self.layer is None:
+                self.layer = pygame.Surface(
+                    (self.width, self.height)).convert()
+            self.layer.fill(self.fill_colour)
+            self.dynamic_rect = pygame.Rect(compose(self.layer))
+            self.dirty = False
+            self.needs_full_redraw = True
+        if self.needs_full_redraw:
+            surface.blit(self.layer, (0, 0))
+            draw_dynamic(surface, dynamic_state)
+            self.needs_full_redraw = False
+            self.last_dynamic_state = dynamic_state
+            return [surface.get_rect()]
+        if dynamic_state == self.last_dynamic_state:
+            return []
+        surface.blit(self.layer, self.dynamic_rect, self.dynamic_rect)
+        draw_dynamic(surface, dynamic_state)
+        self.last_dynamic_state = dynamic_state
+        return [self.dynamic_rect.copy()]
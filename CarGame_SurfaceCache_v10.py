@@ -0,0 +1,84 @@
+from collections import OrderedDict
+
+
+def surface_size_bytes(surface):
+    return (surface.get_width() * surface.get_height() *
+            surface.get_bytesize())
+
+
+class SurfaceCache:
+    """
+    Size-bounded LRU cache of pre-rendered surfaces.
+    Entries are evicted least recently used first once the total
+    size goes over max_bytes.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, size_bytes)
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        # Membership test only; doesn't count as a hit or miss
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def peek(self, key):
+        # Lookup that leaves the LRU order and counters untouched
+        entry = self.entries.get(key)
+        return None if entry is None else entry[0]
+
+    def put(self, key, value, size_bytes=None):
+        # size_bytes only needs passing for values that aren't
+        # plain surfaces
+        if size_bytes is None:
+            size_bytes = surface_size_bytes(value)
+        if key in self.entries:
+            self.total_bytes -= self.entries.pop(key)[1]
+        self.entries[key] = (value, size_bytes)
+        self.total_bytes += size_bytes
+
+        while self.total_bytes > self.max_bytes and self.entries:
+            _, (_, evicted_bytes) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_bytes
+            self.evictions += 1
+
+    def discard(self, key):
+        # Drops the entry for key, if any, e.g. once it's out of date
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def values(self):
+        return [value for value, _ in self.entries.values()]
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self.entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+        }
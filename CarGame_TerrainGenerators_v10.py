@@ -0,0 +1,344 @@
+import threading
+import time
+
+import pygame
+
+try:
+    import numpy
+except ImportError:  # Fall back to per-cell Python loops
+    numpy = None
+
+HASH_PRIME_X = 73856093
+HASH_PRIME_Y = 19349663
+# Hash terms below this magnitude are hashed in int64, larger ones
+# fall back to Python ints
+INT64_SAFE_LIMIT = 2 ** 62
+
+# A 60 fps frame is ~16.7 ms; a chunk must leave room for the rest
+DEFAULT_CHUNK_BUDGET_MS = 4.0
+
+DESERT_COLOURS = [
+    pygame.Color("#C8A165"), pygame.Color("#D6B47A"),
+    pygame.Color("#E2C48F"), pygame.Color("#BB945A")
+]
+SNOW_COLOURS = [
+    pygame.Color("#E8EEF2"), pygame.Color("#FFFFFF"),
+    pygame.Color("#C9D6DF")
+]
+ROAD_COLOURS = [pygame.Color("#3A3A3C"), pygame.Color("#D8D8D0")]
+
+
+def cell_hash(seed, world_grid_x, world_grid_y):
+    return abs(
+        world_grid_x * HASH_PRIME_X ^
+        world_grid_y * HASH_PRIME_Y ^
+        seed
+    )
+
+
+def cell_hashes(seed, first_col, first_row, num_cols, num_rows):
+    """
+    Vectorized cell_hash over a rectangle of grid cells, indexed
+    [col, row] like pygame.surfarray. Gives exactly the values of
+    the scalar version. Requires NumPy.
+    """
+    last_col = first_col + num_cols - 1
+    last_row = first_row + num_rows - 1
+    largest_col_term = max(abs(first_col), abs(last_col)) * HASH_PRIME_X
+    largest_row_term = max(abs(first_row), abs(last_row)) * HASH_PRIME_Y
+    fits_int64 = (
+        largest_col_term < INT64_SAFE_LIMIT and
+        largest_row_term < INT64_SAFE_LIMIT and
+        abs(seed) < INT64_SAFE_LIMIT
+    )
+
+    if not fits_int64:
+        # Far from the origin: use Python ints so the products and
+        # abs() stay arbitrary precision
+        cols = numpy.array(
+            range(first_col, last_col + 1), dtype=object
+        ) * HASH_PRIME_X
+        rows = numpy.array(
+            range(first_row, last_row + 1), dtype=object
+        ) * HASH_PRIME_Y
+        return abs(cols[:, None] ^ rows[None, :] ^ seed)
+
+    cols = numpy.arange(
+        first_col, last_col + 1, dtype=numpy.int64) * HASH_PRIME_X
+    rows = numpy.arange(
+        first_row, last_row + 1, dtype=numpy.int64) * HASH_PRIME_Y
+    # Every term is below 2**62 in magnitude, so the XOR can't reach
+    # -2**63 and abs() can't overflow.
+    return numpy.abs(cols[:, None] ^ rows[None, :] ^ seed)
+
+
+def _grid(first_col, first_row, num_cols, num_rows):
+    # Column and row numbers shaped to broadcast to [col, row]
+    cols = numpy.arange(first_col, first_col + num_cols)[:, None]
+    rows = numpy.arange(first_row, first_row + num_rows)[None, :]
+    return cols, rows
+
+
+class TerrainGenerator:
+    """
+    Base class for procedural terrain. A generator maps each grid
+    cell to an index into self.colours; the chunk contract is
+    generate_chunk(seed, chunk_index, ...) -> indices, which always
+    gives the same result for the same arguments.
+
+    Subclasses implement color_index (scalar) and
+    _color_indices_numpy (vectorized).
+    """
+
+    def __init__(self, colours, chunk_budget_ms=DEFAULT_CHUNK_BUDGET_MS):
+        self.colours = list(colours)
+        self.chunk_budget_ms = chunk_budget_ms
+
+        # Timing stats; chunks may be generated on the prefetch thread
+        self._stats_lock = threading.Lock()
+        self.chunks_generated = 0
+        self.total_generation_ms = 0.0
+        self.max_generation_ms = 0.0
+        self.chunks_over_budget = 0
+
+    def color_index(self, seed, world_grid_x, world_grid_y):
+        raise NotImplementedError
+
+    def _color_indices_numpy(self, seed, first_col, first_row,
+                             num_cols, num_rows):
+        raise NotImplementedError
+
+    def color_indices(self, seed, first_col, first_row,
+                      num_cols, num_rows):
+        # [col, row] array of colour indices, or nested lists
+        # indexed the same way when NumPy isn't available
+        if numpy is not None:
+            return self._color_indices_numpy(
+                seed, first_col, first_row, num_cols, num_rows
+            ).astype(numpy.intp)
+        return [
+            [self.color_index(seed, world_grid_x, world_grid_y)
+             for world_grid_y in range(first_row, first_row + num_rows)]
+            for world_grid_x in range(first_col, first_col + num_cols)
+        ]
+
+    def generate_chunk(self, seed, chunk_index, num_cols, chunk_rows,
+                       first_col=0):
+        start_time = time.perf_counter()
+        indices = self.color_indices(
+            seed, first_col, chunk_index * chunk_rows, num_cols,
+            chunk_rows
+        )
+        elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+
+        with self._stats_lock:
+            self.chunks_generated += 1
+            self.total_generation_ms += elapsed_ms
+            self.max_generation_ms = max(self.max_generation_ms,
+                                         elapsed_ms)
+            if elapsed_ms > self.chunk_budget_ms:
+                self.chunks_over_budget += 1
+        return indices
+
+    def is_fast_enough(self):
+        # Judged on the average so a single slow first chunk (cold
+        # caches) doesn't rule a generator out
+        stats = self.get_stats()
+        return stats['average_ms'] <= self.chunk_budget_ms
+
+    def get_stats(self):
+        with self._stats_lock:
+            chunks = self.chunks_generated
+            average_ms = (self.total_generation_ms / chunks
+                          if chunks else 0.0)
+            return {
+                'chunks': chunks,
+                'average_ms': average_ms,
+                'max_ms': self.max_generation_ms,
+                'over_budget': self.chunks_over_budget,
+                'budget_ms': self.chunk_budget_ms,
+            }
+
+
+class GrassGenerator(TerrainGenerator):
+    # The original hashed grass: every cell picks a colour at random
+    def color_index(self, seed, world_grid_x, world_grid_y):
+        return cell_hash(seed, world_grid_x, world_grid_y) % len(
+            self.colours)
+
+    def _color_indices_numpy(self, seed, first_col, first_row,
+                             num_cols, num_rows):
+        hashes = cell_hashes(seed, first_col, first_row,
+                             num_cols, num_rows)
+        return hashes % len(self.colours)
+
+
+class DesertGenerator(TerrainGenerator):
+    # Diagonal dune bands with a little per-cell jitter
+    DUNE_BAND_ROWS = 4
+    DUNE_SLANT_COLS = 8
+
+    def __init__(self, colours=DESERT_COLOURS, **kwargs):
+        super().__init__(colours, **kwargs)
+
+    def color_index(self, seed, world_grid_x, world_grid_y):
+        jitter = cell_hash(seed, world_grid_x, world_grid_y) % 2
+        band = (
+            world_grid_y + world_grid_x // self.DUNE_SLANT_COLS +
+            jitter
+        ) // self.DUNE_BAND_ROWS
+        return band % len(self.colours)
+
+    def _color_indices_numpy(self, seed, first_col, first_row,
+                             num_cols, num_rows):
+        jitter = cell_hashes(seed, first_col, first_row,
+                             num_cols, num_rows) % 2
+        cols, rows = _grid(first_col, first_row, num_cols, num_rows)
+        band = (
+            rows + cols // self.DUNE_SLANT_COLS + jitter
+        ) // self.DUNE_BAND_ROWS
+        return band % len(self.colours)
+
+
+class SnowGenerator(TerrainGenerator):
+    # Plain snow with occasional sparkle (index 1) and shadow (2)
+    SPECKLE_ONE_IN = 12
+
+    def __init__(self, colours=SNOW_COLOURS, **kwargs):
+        super().__init__(colours, **kwargs)
+
+    def color_index(self, seed, world_grid_x, world_grid_y):
+        speckle = cell_hash(seed, world_grid_x, world_grid_y) % (
+            self.SPECKLE_ONE_IN)
+        return speckle + 1 if speckle < 2 else 0
+
+    def _color_indices_numpy(self, seed, first_col, first_row,
+                             num_cols, num_rows):
+        speckle = cell_hashes(seed, first_col, first_row,
+                              num_cols, num_rows) % self.SPECKLE_ONE_IN
+        return numpy.where(speckle < 2, speckle + 1, 0)
+
+
+class RoadBandGenerator(TerrainGenerator):
+    """
+    A paved band of columns, with a dashed centre line, laid over
+    another generator. Road colours follow the base colours in the
+    palette.
+    """
+    DASH_ROWS = 4
+
+    def __init__(self, base_generator, band_first_col, band_num_cols,
+                 road_colours=ROAD_COLOURS, **kwargs):
+        super().__init__(base_generator.colours + list(road_colours),
+                         **kwargs)
+        self.base_generator = base_generator
+        self.band_first_col = band_first_col
+        self.band_end_col = band_first_col + band_num_cols
+        self.centre_col = band_first_col + band_num_cols // 2
+        self.asphalt_index = len(base_generator.colours)
+        self.marking_index = self.asphalt_index + 1
+
+    def color_index(self, seed, world_grid_x, world_grid_y):
+        if not self.band_first_col <= world_grid_x < self.band_end_col:
+            return self.base_generator.color_index(
+                seed, world_grid_x, world_grid_y)
+        is_dash = (world_grid_y // self.DASH_ROWS) % 2 == 0
+        if world_grid_x == self.centre_col and is_dash:
+            return self.marking_index
+        return self.asphalt_index
+
+    def _color_indices_numpy(self, seed, first_col, first_row,
+                             num_cols, num_rows):
+        indices = self.base_generator._color_indices_numpy(
+            seed, first_col, first_row, num_cols, num_rows)
+        cols, rows = _grid(first_col, first_row, num_cols, num_rows)
+        in_band = ((cols >= self.band_first_col) &
+                   (cols < self.band_end_col))
+        is_dash = (rows // self.DASH_ROWS) % 2 == 0
+        is_marking = (cols == self.centre_col) & is_dash
+        indices = numpy.where(in_band, self.asphalt_index, indices)
+        return numpy.where(is_marking, self.marking_index, indices)
+
+
+class BlendedGenerator(TerrainGenerator):
+    """
+    Cycles through several generators along the track, one per
+    segment_rows grid rows. The first blend_rows rows of a segment
+    dither from the previous generator into the next one. Palettes
+    are concatenated, each generator's indices offset to its part.
+    """
+
+    def __init__(self, generators, segment_rows, blend_rows,
+                 **kwargs):
+        colours = []
+        self.palette_offsets = []
+        for generator in generators:
+            self.palette_offsets.append(len(colours))
+            colours.extend(generator.colours)
+        super().__init__(colours, **kwargs)
+        self.generators = list(generators)
+        self.segment_rows = segment_rows
+        self.blend_rows = blend_rows
+
+    def _generator_slot(self, seed, world_grid_x, world_grid_y):
+        segment = world_grid_y // self.segment_rows
+        row_in_segment = world_grid_y % self.segment_rows
+        if row_in_segment < self.blend_rows:
+            # Salted so the dither doesn't follow the terrain hash
+            dither = cell_hash(seed ^ 0x5EED, world_grid_x,
+                               world_grid_y) % self.blend_rows
+            if dither >= row_in_segment:
+                segment -= 1
+        return segment % len(self.generators)
+
+    def color_index(self, seed, world_grid_x, world_grid_y):
+        slot = self._generator_slot(seed, world_grid_x, world_grid_y)
+        local_index = self.generators[slot].color_index(
+            seed, world_grid_x, world_grid_y)
+        return self.palette_offsets[slot] + local_index
+
+    def _color_indices_numpy(self, seed, first_col, first_row,
+                             num_cols, num_rows):
+        cols, rows = _grid(first_col, first_row, num_cols, num_rows)
+        dither = cell_hashes(seed ^ 0x5EED, first_col, first_row,
+                             num_cols, num_rows) % self.blend_rows
+        row_in_segment = rows % self.segment_rows
+        segments = rows // self.segment_rows - (
+            (row_in_segment < self.blend_rows) &
+            (dither >= row_in_segment)
+        )
+        slots = segments % len(self.generators)
+
+        indices = numpy.zeros((num_cols, num_rows), dtype=numpy.intp)
+        for slot, generator in enumerate(self.generators):
+            in_slot = slots == slot
+            if not in_slot.any():
+                continue
+            local_indices = generator._color_indices_numpy(
+                seed, first_col, first_row, num_cols, num_rows)
+            indices[in_slot] = (
+                local_indices[in_slot] + self.palette_offsets[slot]
+            )
+        return indices
+
+
+def make_terrain_generator(name, grass_colours, num_cols):
+    # Named presets for run_game; num_cols is the track width in
+    # grid cells
+    if name == "desert":
+        return DesertGenerator()
+    if name == "snow":
+        return SnowGenerator()
+    if name == "grass_road":
+        band_num_cols = num_cols // 4
+        return RoadBandGenerator(
+            GrassGenerator(grass_colours),
+            (num_cols - band_num_cols) // 2, band_num_cols
+        )
+    if name == "mixed":
+        return BlendedGenerator(
+            [GrassGenerator(grass_colours), DesertGenerator(),
+             SnowGenerator()],
+            segment_rows=600, blend_rows=40
+        )
+    return GrassGenerator(grass_colours)
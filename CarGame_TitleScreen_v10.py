@@ -1,26 +1,42 @@
 import pygame
 
+from CarGame_FontRegistry_v10 import FontRegistry
+from CarGame_StaticLayer_v10 import StaticLayer
+
 COLOR_BLACK = pygame.Color("black")
 COLOR_WHITE = pygame.Color("white")
 COLOR_PROGRESS_BAR_BG = pygame.Color("gray20")
 COLOR_PROGRESS_BAR_FG = pygame.Color("limegreen")
+COLOR_LOAD_BAR_FG = pygame.Color("steelblue")
 SPACE_HOLD_TARGET_TIME = 1.0
+PROGRESS_BAR_WIDTH = 300
+PROGRESS_BAR_HEIGHT = 25
 
 
 class TitleScreen:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, font_registry=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.title_font = pygame.font.Font(None, 80)
-        self.header_font = pygame.font.Font(None, 48)
-        self.text_font = pygame.font.Font(None, 32)
-        self.small_text_font = pygame.font.Font(None, 28)
+        if font_registry is None:
+            font_registry = FontRegistry()
+        # Shared fonts and rendered-text cache
+        self.font_registry = font_registry
+        self.title_font = font_registry.get_font(None, 80)
+        self.header_font = font_registry.get_font(None, 48)
+        self.text_font = font_registry.get_font(None, 32)
+        self.small_text_font = font_registry.get_font(None, 28)
         # Font for high score
-        self.score_font = pygame.font.Font(None, 40)
+        self.score_font = font_registry.get_font(None, 40)
 
         self.space_held_duration = 0.0
         self.start_game_triggered = False
         self.high_score = 0  # To be set from outside
+        # Fraction of assets loaded; the game can't start before 1.0
+        self.load_progress = 1.0
+
+        # Pre-drawn static part of the screen, rebuilt when flagged
+        self.static_layer = StaticLayer(screen_width, screen_height,
+                                        COLOR_BLACK)
 
         self.controls_lines = [
             "W - Drive", "S - Reverse",
@@ -34,11 +50,16 @@ class TitleScreen:
         ]
 
     def set_high_score(self, score):
-        self.high_score = score
+        if score != self.high_score:
+            self.high_score = score
+            self.static_layer.dirty = True
+
+    def set_load_progress(self, progress):
+        self.load_progress = progress
 
     def _draw_text_line(self, surface, text, font, color,
                         center_x_pos, y_pos, align_left_x=None):
-        text_surface = font.render(text, True, color)
+        text_surface = self.font_registry.render(font, text, True, color)
         if align_left_x is not None:
             text_rect = text_surface.get_rect(left=align_left_x,
                                               top=y_pos)
@@ -50,10 +71,15 @@ class TitleScreen:
     def reset(self):
         self.space_held_duration = 0.0
         self.start_game_triggered = False
+        self.static_layer.needs_full_redraw = True
 
     def update(self, delta_time, keys_pressed):
         if self.start_game_triggered:
             return
+        if self.load_progress < 1.0:
+            # Holding SPACE only counts once loading has finished
+            self.space_held_duration = 0.0
+            return
         if keys_pressed[pygame.K_SPACE]:
             self.space_held_duration += delta_time
         else:
@@ -64,89 +90,116 @@ class TitleScreen:
     def should_start_game(self):
         return self.start_game_triggered
 
-    def draw(self, surface):
-        surface.fill(COLOR_BLACK)
+    def _compose_static_layer(self, layer):
+        # Everything except the progress bar and its label, drawn
+        # once per change of high score
         center_x = self.screen_width // 2
 
         # High Score Display (Top Right)
         high_score_text = f"High Score: {self.high_score}"
-        hs_text_surface = self.score_font.render(
-            high_score_text, True, COLOR_WHITE
+        hs_text_surface = self.font_registry.render(
+            self.score_font, high_score_text, True, COLOR_WHITE
         )
         hs_text_rect = hs_text_surface.get_rect(
             right=self.screen_width - 20, top=20
         )
-        surface.blit(hs_text_surface, hs_text_rect)
+        layer.blit(hs_text_surface, hs_text_rect)
 
         current_y = 70
         self._draw_text_line(
-            surface, "Car Game", self.title_font,
+            layer, "Car Game", self.title_font,
             COLOR_WHITE, center_x, current_y
         )
         current_y += 100
 
         self._draw_text_line(
-            surface, "Controls:", self.header_font,
+            layer, "Controls:", self.header_font,
             COLOR_WHITE, center_x, current_y
         )
         current_y += 50
         for line in self.controls_lines:
             self._draw_text_line(
-                surface, line, self.text_font,
+                layer, line, self.text_font,
                 COLOR_WHITE, center_x, current_y
             )
             current_y += 35
 
         current_y += 30
         self._draw_text_line(
-            surface, "How to play:", self.header_font,
+            layer, "How to play:", self.header_font,
             COLOR_WHITE, center_x, current_y
         )
         current_y += 50
         for line in self.how_to_play_lines:
             self._draw_text_line(
-                surface, line, self.small_text_font,
+                layer, line, self.small_text_font,
                 COLOR_WHITE, center_x, current_y
             )
             current_y += 30
         current_y += 40
 
-        progress_bar_width = 300
-        progress_bar_height = 25
-        progress_bar_x = (self.screen_width - progress_bar_width) // 2
-        progress_bar_y = current_y + 20
-
-        rect_pb_bg = (
-            progress_bar_x, progress_bar_y,
-            progress_bar_width, progress_bar_height
-        )
-        pygame.draw.rect(
-            surface, COLOR_PROGRESS_BAR_BG, rect_pb_bg
+        self.progress_bar_y = current_y + 20
+        self.hold_message_y = self.progress_bar_y - 30
+        # Band holding the bar and its label, redrawn when they change
+        return pygame.Rect(
+            0, self.hold_message_y, self.screen_width,
+            self.progress_bar_y + PROGRESS_BAR_HEIGHT -
+            self.hold_message_y
         )
 
+    def _get_dynamic_state(self):
+        # (bar fill width, bar colour, label): all the dynamic part
+        # depends on
         progress_ratio = (
             self.space_held_duration / SPACE_HOLD_TARGET_TIME
         )
+        progress_bar_colour = COLOR_PROGRESS_BAR_FG
+        if self.load_progress < 1.0:
+            # Same bar shows loading progress until the game can start
+            progress_ratio = self.load_progress
+            progress_bar_colour = COLOR_LOAD_BAR_FG
         current_progress_fill = (
-            min(progress_ratio, 1.0) * progress_bar_width
-        )
-        rect_pb_fg = (
-            progress_bar_x, progress_bar_y,
-            current_progress_fill, progress_bar_height
-        )
-        pygame.draw.rect(
-            surface, COLOR_PROGRESS_BAR_FG, rect_pb_fg
+            min(progress_ratio, 1.0) * PROGRESS_BAR_WIDTH
         )
 
-        hold_message_y = progress_bar_y - 30
         held_s = f"{self.space_held_duration:.1f}s"
         target_s = f"{SPACE_HOLD_TARGET_TIME:.1f}s"
         hold_text = (
             f"Hold SPACE to begin ({held_s} / {target_s})"
         )
-        if self.space_held_duration >= SPACE_HOLD_TARGET_TIME:
+        if self.load_progress < 1.0:
+            hold_text = f"Loading... {int(self.load_progress * 100)}%"
+        elif self.space_held_duration >= SPACE_HOLD_TARGET_TIME:
             hold_text = "Starting!"
+        return current_progress_fill, progress_bar_colour, hold_text
+
+    def _draw_dynamic(self, surface, dynamic_state):
+        current_progress_fill, progress_bar_colour, hold_text = (
+            dynamic_state
+        )
+        progress_bar_x = (self.screen_width - PROGRESS_BAR_WIDTH) // 2
+        rect_pb_bg = (
+            progress_bar_x, self.progress_bar_y,
+            PROGRESS_BAR_WIDTH, PROGRESS_BAR_HEIGHT
+        )
+        pygame.draw.rect(
+            surface, COLOR_PROGRESS_BAR_BG, rect_pb_bg
+        )
+        rect_pb_fg = (
+            progress_bar_x, self.progress_bar_y,
+            current_progress_fill, PROGRESS_BAR_HEIGHT
+        )
+        pygame.draw.rect(
+            surface, progress_bar_colour, rect_pb_fg
+        )
         self._draw_text_line(
             surface, hold_text, self.text_font,
-            COLOR_WHITE, center_x, hold_message_y
+            COLOR_WHITE, self.screen_width // 2, self.hold_message_y
+        )
+
+    def draw(self, surface):
+        # Rects of surface that changed, for pygame.display.update()
+        return self.static_layer.draw(
+            surface, self._compose_static_layer,
+            self._get_dynamic_state(), self._draw_dynamic
         )
@@ -0,0 +1,73 @@
+import math
+
+import pygame
+
+# Levels the zoom snaps to, largest first. Sprites and background
+# chunks are pre-scaled once per level. Tenths keep the 10px grass
+# cells (and so the chunks) a whole number of pixels at every level.
+VIEW_ZOOM_LEVELS = (1.0, 0.9, 0.8, 0.7)
+
+
+class ViewZoom:
+    """
+    Zoom of the gameplay view about an anchor point on screen, the
+    bottom centre, so zooming out shows more of the road ahead.
+
+    Only drawing is zoomed. Simulation, collisions and culling keep
+    working in unzoomed screen pixels ("base" pixels below), and
+    draw code maps base positions to the screen with to_screen().
+    The zoom always sits on one of a few fixed levels, so sprites
+    and background chunks can be drawn from copies pre-scaled to
+    exactly that level instead of being scaled every frame.
+    """
+
+    def __init__(self, screen_width, screen_height,
+                 levels=VIEW_ZOOM_LEVELS):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.levels = tuple(sorted(levels, reverse=True))
+        self.anchor_x = screen_width / 2
+        self.anchor_y = screen_height
+        self.zoom = self.nearest_level(1.0)
+
+    def nearest_level(self, zoom):
+        return min(self.levels, key=lambda level: abs(level - zoom))
+
+    def set_zoom(self, zoom):
+        # Snaps to the nearest level; returns the level used
+        self.zoom = self.nearest_level(zoom)
+        return self.zoom
+
+    def is_zoomed(self):
+        return self.zoom != 1.0
+
+    def to_screen(self, base_x, base_y):
+        # Screen position of a point at (base_x, base_y) base pixels
+        return (
+            self.anchor_x + (base_x - self.anchor_x) * self.zoom,
+            self.anchor_y + (base_y - self.anchor_y) * self.zoom
+        )
+
+    def get_base_rect(self):
+        # get_base_bounds() as a Rect, grown to whole pixels
+        left, top, right, bottom = self.get_base_bounds()
+        left = math.floor(left)
+        top = math.floor(top)
+        return pygame.Rect(left, top, math.ceil(right) - left,
+                           math.ceil(bottom) - top)
+
+    def get_base_bounds(self, zoom=None):
+        """
+        (left, top, right, bottom) of the area in base pixels that
+        ends up on screen at zoom (default: the current level);
+        larger than the screen when zoomed out.
+        """
+        if zoom is None:
+            zoom = self.zoom
+        left = self.anchor_x - self.anchor_x / zoom
+        top = self.anchor_y - self.anchor_y / zoom
+        right = self.anchor_x + (
+            self.screen_width - self.anchor_x) / zoom
+        bottom = self.anchor_y + (
+            self.screen_height - self.anchor_y) / zoom
+        return left, top, right, bottom